@@ -0,0 +1,174 @@
+import ast
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+
+APPROVED_FILE = ".cache/approved_scripts.json"
+
+# Formatting-only pycodestyle codes (whitespace, blank lines, line length). They are not worth an
+# LLM review on their own; pyflakes (F), statement (E7) and syntax (E9) codes are.
+FORMATTING_CODES = ("E1", "E2", "E3", "E5", "W")
+
+# `script` is the earlier reviewer output to use instead of the script, when there is one
+AuditDecision = namedtuple("AuditDecision", ["audit", "reason", "script"], defaults=(None,))
+
+# Nodes that add a decision point, as in McCabe's cyclomatic complexity (match_case is 3.10+)
+BRANCH_NODES = (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.Assert,
+                ast.comprehension) + ((ast.match_case,) if hasattr(ast, "match_case") else ())
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+
+def source_digest(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _complexity(node):
+    """Cyclomatic complexity of one scope, not descending into nested functions."""
+    score = 1
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, SCOPE_NODES):
+            continue
+        if isinstance(child, BRANCH_NODES):
+            score += 1
+            if isinstance(child, ast.comprehension):
+                score += len(child.ifs)
+        elif isinstance(child, ast.BoolOp):
+            score += len(child.values) - 1
+        stack.extend(ast.iter_child_nodes(child))
+    return score
+
+
+def max_complexity(tree):
+    """Returns the highest cyclomatic complexity of the module body and of any function in it."""
+    return max([_complexity(tree)] + [_complexity(node) for node in ast.walk(tree) if isinstance(node, SCOPE_NODES)])
+
+
+class AuditPolicy:
+    def __init__(self, max_lines=200, max_complexity=10, ignored_codes=FORMATTING_CODES,
+                 approved_file=APPROVED_FILE):
+        """
+        Decides whether a generated script needs the (slow, paid) LLM audit.
+
+        A script is audited when static analysis reports anything besides formatting, when it is
+        longer than `max_lines`, or when a function is more complex than `max_complexity`. Scripts
+        whose exact content was audited before are never audited again; when that review produced
+        an improved script that is still on disk, the decision points to it.
+
+        Args:
+            max_lines (int): Clean scripts up to this many lines skip the audit.
+            max_complexity (int): Clean scripts whose functions all stay at or below this cyclomatic
+                complexity skip the audit.
+            ignored_codes (tuple): Diagnostic code prefixes that do not require an audit.
+            approved_file (str): JSON file mapping the content hashes of audited scripts to their
+                improved versions (None keeps them in memory only).
+        """
+        self.max_lines = max_lines
+        self.max_complexity = max_complexity
+        self.ignored_codes = tuple(ignored_codes)
+        self.approved_file = approved_file
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._approved = self._load_approved()
+
+    def _load_approved(self):
+        if not self.approved_file or not os.path.exists(self.approved_file):
+            return {}
+        try:
+            with open(self.approved_file, "r", encoding="utf-8") as f:
+                approved = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable approved scripts file {self.approved_file}: {e}")
+            return {}
+        if isinstance(approved, list):
+            # Older files only listed the hashes of approved scripts
+            return dict.fromkeys(approved)
+        return approved
+
+    def improved_version(self, digest):
+        """
+        Returns the path of the improved script recorded for an audited script's hash, or None
+        when the review kept the script as it was or the improved file has changed since.
+        """
+        improved = self._approved.get(digest)
+        if not improved:
+            return None
+        try:
+            with open(improved["script"], "r", encoding="utf-8") as f:
+                if source_digest(f.read()) == improved["digest"]:
+                    return improved["script"]
+        except (OSError, UnicodeDecodeError):
+            pass
+        return None
+
+    def decide(self, source, diagnostics=()):
+        """
+        Args:
+            source (str): Script source.
+            diagnostics (list): Static analysis diagnostics for the script.
+
+        Returns:
+            AuditDecision: Whether to audit and why.
+        """
+        digest = source_digest(source)
+        if digest in self._approved:
+            improved = self.improved_version(digest)
+            if improved:
+                return AuditDecision(False, f"identical script was audited before, improved as {improved}", improved)
+            if self._approved[digest] is None:
+                return AuditDecision(False, "identical script was audited before")
+
+        issues = [d for d in diagnostics if not d.code.startswith(self.ignored_codes)]
+        if issues:
+            return AuditDecision(True, f"{len(issues)} static analysis issues")
+
+        lines = source.count("\n") + (not source.endswith("\n"))
+        if lines > self.max_lines:
+            return AuditDecision(True, f"{lines} lines exceeds {self.max_lines}")
+
+        try:
+            complexity = max_complexity(ast.parse(source))
+        except SyntaxError:
+            return AuditDecision(True, "script does not parse")
+        if complexity > self.max_complexity:
+            return AuditDecision(True, f"cyclomatic complexity {complexity} exceeds {self.max_complexity}")
+
+        return AuditDecision(False, "clean, small and simple")
+
+    def approve(self, source, improved_script=None):
+        """
+        Records a script as audited, so an identical script skips the audit next time.
+
+        Args:
+            source (str): Source of the script that was reviewed.
+            improved_script (str): Path of the reviewer's improved version, which an identical
+                script reuses instead of being reviewed again. The improved version is approved too.
+        """
+        digest = source_digest(source)
+        updates = {digest: None}
+        if improved_script:
+            with open(improved_script, "r", encoding="utf-8") as f:
+                improved_digest = source_digest(f.read())
+            updates[improved_digest] = None
+            if improved_digest != digest:
+                updates[digest] = {"script": improved_script, "digest": improved_digest}
+        with self._lock:
+            changed = {key: value for key, value in updates.items()
+                       if key not in self._approved or (value and self._approved[key] != value)}
+            if not changed:
+                return
+            self._approved.update(changed)
+            if not self.approved_file:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.approved_file) or ".", exist_ok=True)
+                tmp_file = f"{self.approved_file}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(self._approved, f, sort_keys=True)
+                os.replace(tmp_file, self.approved_file)
+            except OSError as e:
+                self.logger.error(f"Could not save approved scripts to {self.approved_file}: {e}")
@@ -1,52 +1,94 @@
 import os
-import subprocess
 import logging
-from openai_python_code_improver import PythonCodeReviewer
+import threading
+from agents.metrics import get_metrics
+from agents.static_analysis import analyze_scripts, format_diagnostic
 
-# Initialize the code reviewer using the OpenAI API key from the environment
+# The code reviewer uses the OpenAI API key from the environment. It is created on first use,
+# so runs that never audit do not import the OpenAI SDK.
 API_KEY = os.getenv("OPENAI_API_KEY")
-reviewer = PythonCodeReviewer(api_key=API_KEY)
+reviewer = None
+_reviewer_lock = threading.Lock()
+
+def get_reviewer():
+    """Returns the shared PythonCodeReviewer, creating it on first use."""
+    global reviewer
+    with _reviewer_lock:
+        if reviewer is None:
+            from openai_python_code_improver import PythonCodeReviewer
+            reviewer = PythonCodeReviewer(api_key=API_KEY)
+        return reviewer
+
+def collect_diagnostics(script_path):
+    """
+    Run flake8-equivalent static analysis on the script in-process (no flake8 subprocess).
+    
+    Returns a list of Diagnostic tuples; an empty list means the script passed the checks.
+    """
+    with get_metrics().stage("static_analysis"):
+        diagnostics = analyze_scripts([script_path])[script_path]
+    if not diagnostics:
+        logging.info(f"{script_path} passed static analysis checks.")
+    else:
+        report = "\n".join(format_diagnostic(d) for d in diagnostics)
+        logging.error(f"Static analysis issues in {script_path}:\n{report}")
+    return diagnostics
 
 def run_static_analysis(script_path):
     """
-    Run static analysis on the script using flake8 to check for style and common issues.
+    Run static analysis on the script to check for style and common issues.
     
     Returns True if the script passes the checks, False otherwise.
     """
-    try:
-        # Run flake8 as a subprocess and capture its output
-        result = subprocess.run(["flake8", script_path], capture_output=True, text=True)
-        if result.returncode == 0:
-            logging.info(f"{script_path} passed flake8 checks.")
-            return True
-        else:
-            logging.error(f"Static analysis issues in {script_path}:\n{result.stdout}\n{result.stderr}")
-            return False
-    except Exception as e:
-        logging.exception(f"Error running static analysis on {script_path}: {e}")
-        return False
+    return not collect_diagnostics(script_path)
+
+def read_source(script_path):
+    with open(script_path, "r", encoding="utf-8") as f:
+        return f.read()
 
-def review_and_improve(script_path):
+def review_and_improve(script_path, mode=None, policy=None):
     """
     Uses the AI-based PythonCodeReviewer to review and improve the script.
     It first optionally runs static analysis before invoking the reviewer.
+    `mode` selects a "full" rewrite or a "diff" review (default: the reviewer's mode).
+    With an AuditPolicy, scripts the policy considers clean or already audited skip the reviewer.
     
     Returns the path to the improved script if successful, otherwise returns the original script path.
     """
     logging.info(f"Starting review and improvement for {script_path}...")
 
-    # Step 1: Run static analysis; if issues are found, log them (you might decide to halt or continue)
-    if not run_static_analysis(script_path):
+    # Step 1: Run static analysis; issues are passed to the reviewer so it can fix them
+    diagnostics = collect_diagnostics(script_path)
+
+    source = None
+    if policy is not None:
+        try:
+            source = read_source(script_path)
+        except (OSError, UnicodeDecodeError) as e:
+            logging.error(f"Cannot read {script_path} for the audit policy: {e}")
+        else:
+            decision = policy.decide(source, diagnostics)
+            get_metrics().count("audits_skipped" if not decision.audit else "audits_required")
+            if not decision.audit:
+                logging.info(f"Skipping AI review of {script_path}: {decision.reason}.")
+                return decision.script or script_path
+            logging.info(f"AI review of {script_path} required: {decision.reason}.")
+
+    if diagnostics:
         logging.warning("Static analysis reported issues. Proceeding with AI-based improvement anyway.")
     
     try:
         # Invoke the PythonCodeReviewer to improve the code.
-        reviewer.review_and_improve_code(script_path)
+        with get_metrics().stage("ai_review"):
+            get_reviewer().review_and_improve_code(script_path, diagnostics=diagnostics, mode=mode)
         
         # The reviewer is designed to save an improved version as {original}_improved.py.
         improved_script = script_path.replace(".py", "_improved.py")
         if os.path.exists(improved_script):
             logging.info(f"Improved script available at {improved_script}.")
+            if policy is not None and source is not None:
+                # The next identical script reuses this review's output instead of a new review
+                policy.approve(source, improved_script)
             return improved_script
         else:
             logging.error("Improved script was not created by the code reviewer.")
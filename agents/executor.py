@@ -1,11 +1,35 @@
+import os
 import subprocess
 import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
-def execute_script(script_path, timeout=10):
+from agents.metrics import get_metrics
+from agents.sandbox import DEFAULT_LIMITS, limited_command, supervise
+
+# Outcome of one script run. cpu_time is in seconds and max_rss in kilobytes; both are 0 when unknown.
+# stdout_dropped/stderr_dropped count the bytes cut from the front of the output by the output limit.
+ExecutionResult = namedtuple("ExecutionResult",
+                             ["returncode", "stdout", "stderr", "timed_out", "duration", "cpu_time", "max_rss",
+                              "stdout_dropped", "stderr_dropped"],
+                             defaults=(0, 0))
+
+
+def execute_script(script_path, timeout=10, pool=None, limits=None):
     """
     Executes the specified Python script and logs its output.
     Returns True if execution is successful within the timeout, otherwise False.
+
+    Args:
+        pool (WarmInterpreterPool): Run the script on a pre-started interpreter instead of a new one.
+        limits (SandboxLimits): Run the script under CPU, memory, file and output limits.
     """
+    if pool is not None:
+        return log_result(script_path, pool.run(script_path, timeout=timeout, limits=limits), timeout)
+    if limits is not None:
+        if os.name == "posix":
+            return log_result(script_path, run_sandboxed(script_path, timeout, limits), timeout)
+        logging.warning(f"Resource limits are not supported on this platform; running {script_path} without them.")
     try:
         result = subprocess.run(["python", script_path], capture_output=True, text=True, timeout=timeout)
         logging.info(f"Execution output for {script_path}:\n{result.stdout}")
@@ -22,6 +46,84 @@ def execute_script(script_path, timeout=10):
         logging.exception(f"Error executing {script_path}: {e}")
         return False
 
+
+def run_sandboxed(script_path, timeout=10, limits=DEFAULT_LIMITS):
+    """
+    Runs a script in its own process group under resource limits (POSIX only).
+
+    Output is streamed into bounded buffers instead of being captured whole, and the process group
+    is killed on timeout, so neither a runaway print loop nor leftover background processes can
+    exhaust the host.
+
+    Returns:
+        ExecutionResult: Exit code, kept output, timing, peak memory and truncation counts.
+    """
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    try:
+        # Limits are applied by an exec wrapper: preexec_fn is unsafe in the threads scripts run from
+        process = subprocess.Popen(limited_command(["python", script_path], limits), stdin=subprocess.DEVNULL,
+                                   stdout=out_w, stderr=err_w, start_new_session=True)
+    except OSError:
+        for fd in (out_r, err_r):
+            os.close(fd)
+        raise
+    finally:
+        os.close(out_w)
+        os.close(err_w)
+    result = supervise(process.pid, out_r, err_r, timeout=timeout, output_bytes=limits.output_bytes)
+    # supervise() reaped the child; tell Popen so it does not try again
+    process.returncode = result["returncode"]
+    return ExecutionResult(**result)
+
+
+def log_result(script_path, result, timeout):
+    """Logs an ExecutionResult the same way execute_script logs a subprocess run."""
+    get_metrics().record("execution", script=script_path, returncode=result.returncode, timed_out=result.timed_out,
+                         seconds=round(result.duration, 6), cpu_time=round(result.cpu_time, 6),
+                         max_rss=result.max_rss, stdout_dropped=result.stdout_dropped,
+                         stderr_dropped=result.stderr_dropped)
+    if result.timed_out:
+        logging.warning(f"Execution of {script_path} timed out after {timeout} seconds.")
+        return False
+    logging.info(f"Execution output for {script_path}:\n{result.stdout}")
+    logging.info(f"{script_path} ran in {result.duration:.3f}s "
+                 f"(cpu {result.cpu_time:.3f}s, max rss {result.max_rss} KB).")
+    if result.stdout_dropped or result.stderr_dropped:
+        logging.warning(f"{script_path} output truncated: {result.stdout_dropped} bytes of stdout and "
+                        f"{result.stderr_dropped} bytes of stderr dropped.")
+    if result.returncode == 0:
+        logging.info(f"{script_path} executed successfully.")
+        return True
+    logging.error(f"{script_path} execution failed:\n{result.stderr}")
+    return False
+
+def default_execution_workers():
+    """One concurrent script per CPU: generated scripts are usually CPU-bound."""
+    return os.cpu_count() or 1
+
+
+def execute_scripts(script_paths, max_workers=None, timeout=10, pool=None, limits=None):
+    """
+    Executes several scripts concurrently, each with its own timeout.
+
+    Args:
+        script_paths (iterable): Scripts to run.
+        max_workers (int): Scripts running at the same time (default: one per CPU).
+        timeout, pool, limits: Passed on to execute_script.
+
+    Returns:
+        dict: script path -> True if it ran successfully within the timeout.
+    """
+    script_paths = list(script_paths)
+    if not script_paths:
+        return {}
+    max_workers = max_workers or default_execution_workers()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(script_paths))) as executor:
+        results = executor.map(lambda path: execute_script(path, timeout=timeout, pool=pool, limits=limits),
+                               script_paths)
+        return dict(zip(script_paths, results))
+
 # For standalone testing:
 if __name__ == "__main__":
     script = "scripts/script_test.py"
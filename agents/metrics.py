@@ -0,0 +1,224 @@
+import argparse
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+METRICS_FILE = "logs/metrics.jsonl"
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers (q in 0-100); None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_events(events):
+    """
+    Aggregates metric events into a run summary.
+
+    Returns:
+        dict: {"stages": {stage: {count, failed, total, p50, p95, max}}, "counters": {name: value},
+        "tokens": {"prompt", "completion"}}
+    """
+    durations = {}
+    failed = {}
+    counters = {}
+    tokens = {"prompt": 0, "completion": 0}
+    for event in events:
+        kind = event.get("event")
+        if kind == "stage":
+            durations.setdefault(event["stage"], []).append(event["seconds"])
+            if not event.get("ok", True):
+                failed[event["stage"]] = failed.get(event["stage"], 0) + 1
+        elif kind == "count":
+            counters[event["name"]] = counters.get(event["name"], 0) + event.get("value", 1)
+        elif kind == "usage":
+            tokens["prompt"] += event.get("prompt_tokens") or 0
+            tokens["completion"] += event.get("completion_tokens") or 0
+
+    stages = {}
+    for stage, values in durations.items():
+        stages[stage] = {
+            "count": len(values),
+            "failed": failed.get(stage, 0),
+            "total": round(sum(values), 6),
+            "p50": round(percentile(values, 50), 6),
+            "p95": round(percentile(values, 95), 6),
+            "max": round(max(values), 6),
+        }
+    return {"stages": stages, "counters": counters, "tokens": tokens}
+
+
+def format_summary(summary):
+    """Formats a run summary as a table, slowest stage (by total time) first."""
+    lines = [f"{'stage':<16}{'count':>7}{'failed':>8}{'total s':>10}{'p50 s':>9}{'p95 s':>9}{'max s':>9}"]
+    for stage, s in sorted(summary["stages"].items(), key=lambda item: -item[1]["total"]):
+        lines.append(f"{stage:<16}{s['count']:>7}{s['failed']:>8}{s['total']:>10.3f}{s['p50']:>9.3f}"
+                     f"{s['p95']:>9.3f}{s['max']:>9.3f}")
+    tokens = summary["tokens"]
+    lines.append(f"tokens: {tokens['prompt']} prompt, {tokens['completion']} completion")
+    if summary["counters"]:
+        lines.append("counters: " + ", ".join(f"{name}={value}" for name, value in sorted(summary["counters"].items())))
+    return "\n".join(lines)
+
+
+class MetricsRecorder:
+    def __init__(self, path=None, run_id=None, enabled=True):
+        """
+        Collects timing, token and counter events for one run.
+
+        Every event is appended to `path` as a JSON line tagged with the run id, and kept in
+        memory for summary(). Safe to use from several threads.
+
+        Args:
+            path (str): JSON lines file to append to (None: keep events in memory only).
+            run_id (str): Identifies this run's events in the file (default: a random id).
+            enabled (bool): False turns every method into a no-op.
+        """
+        self.enabled = enabled
+        self.path = path
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file = None
+        if path and enabled:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, event, **fields):
+        """Records one event. Events recorded inside stage() carry that stage's task id."""
+        if not self.enabled:
+            return
+        entry = {"ts": round(time.time(), 6), "run": self.run_id, "event": event}
+        task = getattr(self._local, "task", None)
+        if task is not None and "task" not in fields:
+            entry["task"] = task
+        entry.update(fields)
+        with self._lock:
+            self.events.append(entry)
+            if self._file:
+                self._file.write(json.dumps(entry) + "\n")
+                self._file.flush()
+
+    @contextmanager
+    def task(self, task_id):
+        """Tags the events recorded by this thread inside the block with a task id."""
+        outer = getattr(self._local, "task", None)
+        self._local.task = task_id
+        try:
+            yield
+        finally:
+            self._local.task = outer
+
+    @contextmanager
+    def stage(self, name, task=None):
+        """
+        Times a pipeline stage. The stage counts as failed if it raises or if the caller sets
+        `ok = False` on the yielded object. Events recorded inside it carry `task`.
+        """
+        timer = _StageTimer()
+        start = time.perf_counter()
+        try:
+            if task is None:
+                yield timer
+            else:
+                with self.task(task):
+                    yield timer
+        except BaseException:
+            timer.ok = False
+            raise
+        finally:
+            fields = {"stage": name, "seconds": round(time.perf_counter() - start, 6), "ok": timer.ok}
+            if task is not None:
+                fields["task"] = task
+            self.record("stage", **fields)
+
+    def count(self, name, value=1):
+        """Records a counter increment, e.g. a cache hit or a retry."""
+        self.record("count", name=name, value=value)
+
+    def usage(self, model, prompt_tokens, completion_tokens, source="api"):
+        """Records token usage reported by the API."""
+        self.record("usage", model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                    source=source)
+
+    def summary(self):
+        with self._lock:
+            events = list(self.events)
+        return summarize_events(events)
+
+    def write_summary(self):
+        """Records the run summary as a "summary" event and returns it."""
+        summary = self.summary()
+        self.record("summary", **summary)
+        return summary
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class _StageTimer:
+    def __init__(self):
+        self.ok = True
+
+
+# Recorder used by instrumented code; disabled until a run installs one with set_metrics()
+_active = MetricsRecorder(enabled=False)
+
+
+def get_metrics():
+    return _active
+
+
+def set_metrics(recorder):
+    """Makes `recorder` the one returned by get_metrics() and returns the previous one."""
+    global _active
+    previous, _active = _active, recorder
+    return previous
+
+
+def load_events(path=METRICS_FILE, run_id=None):
+    """
+    Reads the events of one run from a metrics file.
+
+    Args:
+        run_id (str): Run to read (default: the last run in the file).
+    """
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                events.append(json.loads(line))
+    if run_id is None and events:
+        run_id = events[-1]["run"]
+    return [event for event in events if event.get("run") == run_id and event.get("event") != "summary"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the per-stage metrics of a run.")
+    parser.add_argument("path", nargs="?", default=METRICS_FILE, help=f"Metrics file (default: {METRICS_FILE})")
+    parser.add_argument("--run", default=None, help="Run id to summarize (default: the last run)")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = summarize_events(load_events(args.path, args.run))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Resource limits and bounded output capture for running untrusted scripts.
+
+Only the standard library is used: agents/warm_worker.py loads this module in its
+stand-alone interpreter, and run as a script it is the exec wrapper of limited_command.
+"""
+import json
+import os
+import selectors
+import signal
+import sys
+import time
+from collections import namedtuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+SandboxLimits = namedtuple("SandboxLimits", ["cpu_seconds", "memory", "open_files", "processes", "output_bytes"],
+                           defaults=(None, None, None, None, None))
+
+# Limits used by the --sandbox mode. RLIMIT_NPROC counts every process of the user, not just the
+# script's children, so it is left unset unless scripts run under a dedicated account.
+DEFAULT_LIMITS = SandboxLimits(
+    cpu_seconds=10,
+    memory=1024 * 1024 * 1024,
+    open_files=256,
+    processes=None,
+    output_bytes=1024 * 1024,
+)
+
+RLIMIT_NAMES = {
+    "cpu_seconds": "RLIMIT_CPU",
+    "memory": "RLIMIT_AS",
+    "open_files": "RLIMIT_NOFILE",
+    "processes": "RLIMIT_NPROC",
+}
+
+READ_CHUNK = 65536
+POLL_INTERVAL = 0.05
+# How long output is still drained after the script's process group was killed
+DRAIN_GRACE = 1.0
+
+
+def rlimit_settings(limits):
+    """Returns the (RLIMIT name, value) pairs to apply for a SandboxLimits, skipping unset fields."""
+    if limits is None:
+        return []
+    return [(RLIMIT_NAMES[field], value) for field, value in limits._asdict().items()
+            if field in RLIMIT_NAMES and value is not None]
+
+
+def apply_limits(settings):
+    """
+    Applies rlimit settings to the current process. Meant to run in the child, between fork and exec.
+    Limits can only be lowered, so a value above the inherited hard limit is clamped to it.
+    """
+    if resource is None:
+        return
+    for name, value in settings:
+        which = getattr(resource, name, None)
+        if which is None:
+            continue
+        _, hard = resource.getrlimit(which)
+        soft = value if hard == resource.RLIM_INFINITY else min(value, hard)
+        if name == "RLIMIT_CPU":
+            # SIGXCPU at the soft limit lets Python report it; the hard limit is a SIGKILL backstop
+            new_hard = soft + 1 if hard == resource.RLIM_INFINITY else min(soft + 1, hard)
+        else:
+            new_hard = soft
+        resource.setrlimit(which, (soft, new_hard))
+
+
+def limited_command(command, limits):
+    """
+    Returns `command` prefixed with an exec wrapper that applies the limits, then execs the
+    command in the same process. Unlike Popen's preexec_fn, this is safe with threads.
+    """
+    settings = rlimit_settings(limits)
+    if not settings:
+        return list(command)
+    # -I -S: the wrapper imports nothing from the environment and starts as fast as possible
+    return [sys.executable, "-I", "-S", os.path.abspath(__file__), json.dumps(settings), "--"] + list(command)
+
+
+class RingBuffer:
+    def __init__(self, limit=None):
+        """
+        Byte buffer that keeps only the last `limit` bytes written to it (all of them if limit is None).
+        The tail is kept because that is where tracebacks end up.
+        """
+        self.limit = limit
+        self.dropped = 0
+        self._data = bytearray()
+
+    def write(self, data):
+        self._data += data
+        if self.limit is not None and len(self._data) > self.limit:
+            excess = len(self._data) - self.limit
+            del self._data[:excess]
+            self.dropped += excess
+
+    def getvalue(self):
+        """Returns the kept output as text, prefixed with a marker if anything was dropped."""
+        text = self._data.decode("utf-8", "replace")
+        if self.dropped:
+            return f"[... {self.dropped} bytes of output truncated ...]\n{text}"
+        return text
+
+
+def _kill_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def supervise(pid, stdout_fd, stderr_fd, timeout=None, output_bytes=None):
+    """
+    Waits for a child process while streaming its output into ring buffers.
+
+    The child should lead its own process group (setsid), so that on timeout, or when it exits
+    while background processes still hold its pipes, the whole group can be killed.
+
+    Args:
+        pid (int): Child process id.
+        stdout_fd (int): Read end of the child's stdout pipe; closed on return.
+        stderr_fd (int): Read end of the child's stderr pipe; closed on return.
+        timeout (float): Wall-clock seconds before the process group is killed.
+        output_bytes (int): Bytes of stdout and of stderr kept, each (None: unbounded).
+
+    Returns:
+        dict: returncode, stdout, stderr, timed_out, duration, cpu_time (seconds), max_rss (KB),
+        stdout_dropped and stderr_dropped (bytes of output discarded).
+    """
+    buffers = {stdout_fd: RingBuffer(output_bytes), stderr_fd: RingBuffer(output_bytes)}
+    selector = selectors.DefaultSelector()
+    for fd in buffers:
+        selector.register(fd, selectors.EVENT_READ)
+
+    start = time.monotonic()
+    status = usage = None
+    timed_out = False
+    killed_at = None
+    try:
+        while True:
+            if selector.get_map():
+                for key, _ in selector.select(POLL_INTERVAL):
+                    data = os.read(key.fd, READ_CHUNK)
+                    if data:
+                        buffers[key.fd].write(data)
+                    else:
+                        selector.unregister(key.fd)
+            else:
+                time.sleep(POLL_INTERVAL / 10)
+
+            if status is None:
+                finished, wait_status, wait_usage = os.wait4(pid, os.WNOHANG)
+                if finished:
+                    status, usage = wait_status, wait_usage
+            now = time.monotonic()
+            if status is not None and not selector.get_map():
+                break
+            if killed_at is None:
+                if timeout is not None and now - start > timeout:
+                    timed_out = True
+                if timed_out or status is not None:
+                    # Timed out, or exited with processes left holding its pipes: end the group
+                    _kill_group(pid)
+                    killed_at = now
+            elif now - killed_at > DRAIN_GRACE:
+                break
+        if status is None:
+            _, status, usage = os.wait4(pid, 0)
+    finally:
+        selector.close()
+        for fd in buffers:
+            os.close(fd)
+
+    out, err = buffers[stdout_fd], buffers[stderr_fd]
+    return {
+        "returncode": os.waitstatus_to_exitcode(status),
+        "stdout": out.getvalue(),
+        "stderr": err.getvalue(),
+        "timed_out": timed_out,
+        "duration": time.monotonic() - start,
+        "cpu_time": usage.ru_utime + usage.ru_stime,
+        "max_rss": usage.ru_maxrss,
+        "stdout_dropped": out.dropped,
+        "stderr_dropped": err.dropped,
+    }
+
+
+if __name__ == "__main__":
+    # Exec wrapper of limited_command: sandbox.py SETTINGS -- COMMAND...
+    apply_limits(json.loads(sys.argv[1]))
+    os.execvp(sys.argv[3], sys.argv[3:])
@@ -0,0 +1,160 @@
+import heapq
+import itertools
+import logging
+
+# Lower rank runs first; tasks without a priority are treated as medium
+PRIORITY_RANKS = {"high": 0, "medium": 1, "low": 2}
+DEFAULT_RANK = PRIORITY_RANKS["medium"]
+
+# Statuses that satisfy a dependency
+SUCCESS_STATUSES = {"completed", "generated_only"}
+# Statuses that mean a task will not run again in this pass
+FINISHED_STATUSES = SUCCESS_STATUSES | {"failed", "error", "execution_failed", "invalid", "blocked"}
+
+
+def priority_rank(task):
+    """
+    Returns the scheduling rank of a task: "high"/"medium"/"low" or a number (lower runs first).
+    """
+    priority = task.get("priority")
+    if isinstance(priority, (int, float)) and not isinstance(priority, bool):
+        return priority
+    if isinstance(priority, str):
+        return PRIORITY_RANKS.get(priority.lower(), DEFAULT_RANK)
+    return DEFAULT_RANK
+
+
+def task_dependencies(task):
+    """
+    Returns the ids listed in a task's `depends_on` field (a single id or a list).
+
+    Ids may be of any hashable type, as tasks.json ids are.
+
+    Raises:
+        ValueError: If `depends_on` holds something that cannot be a task id (None or a container).
+    """
+    depends_on = task.get("depends_on")
+    if depends_on is None:
+        return []
+    dependencies = list(depends_on) if isinstance(depends_on, (list, tuple)) else [depends_on]
+    if any(dep is None or isinstance(dep, (dict, list, tuple, set)) for dep in dependencies):
+        raise ValueError(f"'depends_on' must be a task id or a list of task ids, not {depends_on!r}")
+    return dependencies
+
+
+class TaskScheduler:
+    def __init__(self, tasks=(), aging=100):
+        """
+        Priority queue of pending tasks.
+
+        Tasks are popped by priority, first-in first-out within a priority. A task only becomes
+        ready once every task in its `depends_on` list has succeeded; if a dependency fails the
+        task is blocked instead.
+
+        Args:
+            tasks (iterable): All known tasks, so dependencies on them can be resolved.
+                Pending tasks still have to be queued with push().
+            aging (int): Starvation protection. A ready task outranks tasks of the next higher
+                priority that became ready once that many tasks had been dispatched after it, so
+                a batch queued at once still runs in strict priority order. None disables aging.
+        """
+        self.aging = aging
+        self._heap = []
+        self._counter = itertools.count()
+        self._dispatched = 0
+        self._status = {}
+        self._waiting = {}
+        self._dependents = {}
+        self.logger = logging.getLogger(__name__)
+        for task in tasks:
+            self._status[task.get("id")] = task.get("status")
+
+    def _key(self, task, seq):
+        rank = priority_rank(task)
+        if self.aging:
+            # Each rank is worth `aging` dispatches: tasks that became ready much later than a
+            # waiting lower-priority task no longer overtake it, so it cannot starve
+            return (rank * self.aging + self._dispatched, seq)
+        return (rank, seq)
+
+    def push(self, task):
+        """
+        Queues a pending task, or parks it until its dependencies have succeeded.
+
+        Returns:
+            list: Tasks that became blocked (a dependency failed or is unknown).
+
+        Raises:
+            ValueError: If the task's `depends_on` is malformed; the task is not queued.
+        """
+        task_id = task.get("id")
+        dependencies = task_dependencies(task)
+        self._status[task_id] = "pending"
+        seq = next(self._counter)
+        unmet = []
+        for dep in dependencies:
+            status = self._status.get(dep)
+            if status in SUCCESS_STATUSES:
+                continue
+            if status is None or status in FINISHED_STATUSES:
+                self.logger.error(f"Task {task_id}: dependency {dep} is {status or 'unknown'}; task blocked.")
+                self._status[task_id] = "blocked"
+                return [task] + self._block_dependents(task_id)
+            unmet.append(dep)
+        if unmet:
+            self._waiting[task_id] = (task, seq, set(unmet))
+            for dep in unmet:
+                self._dependents.setdefault(dep, []).append(task_id)
+        else:
+            heapq.heappush(self._heap, (self._key(task, seq), task))
+        return []
+
+    def pop(self):
+        """Returns the next ready task, or None if none is ready."""
+        if not self._heap:
+            return None
+        _, task = heapq.heappop(self._heap)
+        self._dispatched += 1
+        self._status[task.get("id")] = "running"
+        return task
+
+    def mark_done(self, task, status):
+        """
+        Records a finished task and releases tasks that were waiting on it.
+
+        Returns:
+            list: Tasks that became blocked because this one did not succeed.
+        """
+        task_id = task.get("id")
+        self._status[task_id] = status
+        if status not in SUCCESS_STATUSES:
+            return self._block_dependents(task_id)
+        for dependent_id in self._dependents.pop(task_id, []):
+            waiting = self._waiting.get(dependent_id)
+            if waiting is None:
+                continue
+            dependent, seq, unmet = waiting
+            unmet.discard(task_id)
+            if not unmet:
+                del self._waiting[dependent_id]
+                # Ages from now, when it became ready; first-in first-out still follows queue order
+                heapq.heappush(self._heap, (self._key(dependent, seq), dependent))
+        return []
+
+    def _block_dependents(self, task_id):
+        blocked = []
+        for dependent_id in self._dependents.pop(task_id, []):
+            waiting = self._waiting.pop(dependent_id, None)
+            if waiting is None:
+                continue
+            self._status[dependent_id] = "blocked"
+            blocked.append(waiting[0])
+            blocked.extend(self._block_dependents(dependent_id))
+        return blocked
+
+    def unresolved(self):
+        """Returns tasks still waiting on dependencies that can never finish (e.g. cycles)."""
+        return [task for task, _, _ in self._waiting.values()]
+
+    def __len__(self):
+        return len(self._heap)
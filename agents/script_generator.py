@@ -12,16 +12,28 @@ def sanitize_filename(task_description):
     return filename[:50]  # Limit filename length
 
 def generate_unique_filename(base_name):
-    """Ensure unique filename by appending numbers if needed."""
+    """
+    Ensure unique filename by appending numbers if needed.
+
+    The file is created empty to reserve the name, so concurrent tasks
+    with the same base name never end up writing to the same path.
+    """
+    os.makedirs(SCRIPT_DIR, exist_ok=True)
     script_path = os.path.join(SCRIPT_DIR, f"{base_name}.py")
     count = 1
-    while os.path.exists(script_path):
-        script_path = os.path.join(SCRIPT_DIR, f"{base_name}_{count}.py")
-        count += 1
-    return script_path
+    while True:
+        try:
+            with open(script_path, "x", encoding="utf-8"):
+                return script_path
+        except FileExistsError:
+            script_path = os.path.join(SCRIPT_DIR, f"{base_name}_{count}.py")
+            count += 1
 
-def generate_script(prompt, task_description, file_name=None):
-    """Generate Python script dynamically based on task description or provided file name."""
+def generate_script(prompt, task_description, file_name=None, stream=False):
+    """
+    Generate Python script dynamically based on task description or provided file name.
+    With stream=True the script is written to disk while the response is still arriving.
+    """
     extractor = OpenAIScriptExtractor()
 
     # If a filename is provided in the task, use it; otherwise, generate one dynamically
@@ -34,8 +46,11 @@ def generate_script(prompt, task_description, file_name=None):
 
     print(f"Generating script: {script_path}")
     
-    script_content = extractor.fetch_script(prompt)
-    
+    script_content = extractor.fetch_script(prompt, stream=stream, output_file=script_path if stream else None)
+    if script_content is None:
+        os.remove(script_path)
+        return None
+
     with open(script_path, "w", encoding="utf-8") as script_file:
         script_file.write(script_content)
     
@@ -0,0 +1,180 @@
+import ast
+import logging
+from collections import namedtuple
+
+# pyflakes and pycodestyle (both installed with flake8) are used in-process when available;
+# otherwise a smaller built-in AST checker covers the most common problems.
+try:
+    from pyflakes import checker as pyflakes_checker
+except ImportError:
+    pyflakes_checker = None
+
+try:
+    import pycodestyle
+except ImportError:
+    pycodestyle = None
+
+Diagnostic = namedtuple("Diagnostic", ["path", "line", "col", "code", "message"])
+
+MAX_LINE_LENGTH = 79
+
+# flake8 codes for pyflakes message classes
+PYFLAKES_CODES = {
+    "UnusedImport": "F401",
+    "ImportShadowedByLoopVar": "F402",
+    "ImportStarUsed": "F403",
+    "LateFutureImport": "F404",
+    "ImportStarUsage": "F405",
+    "MultiValueRepeatedKeyLiteral": "F601",
+    "MultiValueRepeatedKeyVariable": "F602",
+    "TooManyExpressionsInStarredAssignment": "F621",
+    "TwoStarredExpressions": "F622",
+    "AssertTuple": "F631",
+    "IsLiteral": "F632",
+    "FStringMissingPlaceholders": "F541",
+    "BreakOutsideLoop": "F701",
+    "ContinueOutsideLoop": "F702",
+    "ReturnOutsideFunction": "F706",
+    "DefaultExceptNotLast": "F707",
+    "DoctestSyntaxError": "F721",
+    "ForwardAnnotationSyntaxError": "F722",
+    "RedefinedWhileUnused": "F811",
+    "UndefinedName": "F821",
+    "UndefinedExport": "F822",
+    "UndefinedLocal": "F823",
+    "DuplicateArgument": "F831",
+    "UnusedVariable": "F841",
+    "UnusedAnnotation": "F842",
+    "RaiseNotImplemented": "F901",
+}
+
+
+def format_diagnostic(diagnostic):
+    """Formats a diagnostic the way flake8 prints it."""
+    return f"{diagnostic.path}:{diagnostic.line}:{diagnostic.col}: {diagnostic.code} {diagnostic.message}"
+
+
+def _pyflakes_diagnostics(tree, path):
+    flakes = pyflakes_checker.Checker(tree, filename=path)
+    diagnostics = []
+    for message in flakes.messages:
+        code = PYFLAKES_CODES.get(type(message).__name__, "F999")
+        diagnostics.append(Diagnostic(path, message.lineno, getattr(message, "col", 0) + 1, code,
+                                      message.message % message.message_args))
+    return diagnostics
+
+
+def _builtin_diagnostics(tree, path):
+    """Subset of the pyflakes checks, used when pyflakes is not installed."""
+    diagnostics = []
+    imported = {}
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == "*":
+                    diagnostics.append(Diagnostic(path, node.lineno, node.col_offset + 1, "F403",
+                                                  f"'from {node.module} import *' used"))
+                    continue
+                name = alias.asname or alias.name.split(".")[0]
+                imported[name] = (node, alias.name)
+
+    used = set()
+    exported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            used.add(node.id)
+        elif isinstance(node, ast.ExceptHandler) and node.type is None:
+            diagnostics.append(Diagnostic(path, node.lineno, node.col_offset + 1, "E722", "do not use bare 'except'"))
+        elif isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets):
+            if isinstance(node.value, (ast.List, ast.Tuple)):
+                exported.update(elt.value for elt in node.value.elts if isinstance(elt, ast.Constant))
+
+    for name, (node, full_name) in imported.items():
+        if name not in used and name not in exported and name != "__future__" and full_name != "__future__":
+            diagnostics.append(Diagnostic(path, node.lineno, node.col_offset + 1, "F401",
+                                          f"'{full_name}' imported but unused"))
+    return diagnostics
+
+
+def _builtin_style_diagnostics(lines, path):
+    """Subset of the pycodestyle checks, used when pycodestyle is not installed."""
+    diagnostics = []
+    for number, line in enumerate(lines, start=1):
+        text = line.rstrip("\r\n")
+        if len(text) > MAX_LINE_LENGTH:
+            diagnostics.append(Diagnostic(path, number, MAX_LINE_LENGTH + 1, "E501",
+                                          f"line too long ({len(text)} > {MAX_LINE_LENGTH} characters)"))
+        stripped = text.rstrip()
+        if stripped != text:
+            code, message = ("W293", "blank line contains whitespace") if not stripped else \
+                ("W291", "trailing whitespace")
+            diagnostics.append(Diagnostic(path, number, len(stripped) + 1, code, message))
+    if lines and not lines[-1].endswith("\n"):
+        diagnostics.append(Diagnostic(path, len(lines), len(lines[-1]) + 1, "W292", "no newline at end of file"))
+    return diagnostics
+
+
+if pycodestyle is not None:
+    class _CollectingReport(pycodestyle.BaseReport):
+        """pycodestyle report that keeps errors instead of printing them."""
+
+        def __init__(self, options, path):
+            super().__init__(options)
+            self.path = path
+            self.diagnostics = []
+
+        def error(self, line_number, offset, text, check):
+            code = super().error(line_number, offset, text, check)
+            if code:
+                self.diagnostics.append(Diagnostic(self.path, line_number, offset + 1, code, text[5:]))
+            return code
+
+    _style_guide = pycodestyle.StyleGuide(quiet=True, max_line_length=MAX_LINE_LENGTH)
+
+
+def _style_diagnostics(lines, path):
+    if pycodestyle is None:
+        return _builtin_style_diagnostics(lines, path)
+    report = _CollectingReport(_style_guide.options, path)
+    pycodestyle.Checker(path, lines=lines, options=_style_guide.options, report=report).check_all()
+    return report.diagnostics
+
+
+def analyze_source(source, path="<string>"):
+    """
+    Runs flake8-equivalent checks on source code in-process.
+
+    Returns:
+        list: Diagnostic tuples sorted by position.
+    """
+    try:
+        tree = ast.parse(source, filename=path)
+    except SyntaxError as e:
+        return [Diagnostic(path, e.lineno or 1, (e.offset or 0) + 1, "E999", f"SyntaxError: {e.msg}")]
+
+    if pyflakes_checker is not None:
+        diagnostics = _pyflakes_diagnostics(tree, path)
+    else:
+        diagnostics = _builtin_diagnostics(tree, path)
+    diagnostics.extend(_style_diagnostics(source.splitlines(keepends=True), path))
+    return sorted(diagnostics, key=lambda d: (d.line, d.col, d.code))
+
+
+def analyze_scripts(script_paths):
+    """
+    Analyzes many scripts in one call, without spawning a process per script.
+
+    Returns:
+        dict: script path -> list of Diagnostic tuples.
+    """
+    results = {}
+    for path in script_paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logging.error(f"Cannot analyze {path}: {e}")
+            results[path] = [Diagnostic(path, 1, 1, "E902", str(e))]
+            continue
+        results[path] = analyze_source(source, path)
+    return results
@@ -0,0 +1,319 @@
+import argparse
+import collections
+import json
+import logging
+import math
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from agents.scheduler import PRIORITY_RANKS
+from agents.task_store import TASK_DB, TaskStore
+
+API_PORT = 8700
+# Largest request body accepted, in bytes
+MAX_BODY = 4 * 1024 * 1024
+# Seconds a submission may wait for the writer before the request fails with 503
+COMMIT_TIMEOUT = 10.0
+
+TASK_PATH_RE = re.compile(r"^/tasks/(\d+)$")
+
+logger = logging.getLogger(__name__)
+
+
+class Submission:
+    def __init__(self, tasks):
+        """One request's tasks, waiting for the writer to commit them."""
+        self.tasks = tasks
+        self.ids = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class SubmissionQueue:
+    def __init__(self, store, capacity=1000, max_batch=500, on_commit=None):
+        """
+        Bounded queue between the HTTP handlers and the task store.
+
+        A single writer thread takes whatever has been queued and commits it to the store in
+        one transaction, so concurrent producers neither contend on a file nor pay a commit
+        each. A request is answered once its tasks are committed.
+
+        Args:
+            store (TaskStore): Store the tasks are committed to.
+            capacity (int): Tasks that may wait for the writer; offers beyond it are refused.
+            max_batch (int): Most tasks committed in one transaction.
+            on_commit (callable): Called with the new task ids after every commit.
+        """
+        self.store = store
+        self.capacity = capacity
+        self.max_batch = max_batch
+        self.on_commit = on_commit
+        self.queued = 0
+        self._submissions = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def offer(self, tasks):
+        """
+        Queues a request's tasks as a whole.
+
+        Returns:
+            Submission: To wait on, or None when the queue has no room for all of them.
+        """
+        with self._cond:
+            if self._closed or self.queued + len(tasks) > self.capacity:
+                return None
+            submission = Submission(tasks)
+            self._submissions.append(submission)
+            self.queued += len(tasks)
+            self._cond.notify()
+            return submission
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._submissions and not self._closed:
+                self._cond.wait()
+            batch = []
+            size = 0
+            while self._submissions and (not batch or size + len(self._submissions[0].tasks) <= self.max_batch):
+                submission = self._submissions.popleft()
+                batch.append(submission)
+                size += len(submission.tasks)
+            return batch, size
+
+    def _write_loop(self):
+        while True:
+            batch, size = self._take_batch()
+            if not batch:
+                return
+            try:
+                ids = self.store.add_tasks([task for submission in batch for task in submission.tasks])
+            except Exception as e:
+                logger.error(f"Failed to store {size} submitted tasks: {e}")
+                ids = None
+                for submission in batch:
+                    submission.error = str(e)
+            else:
+                start = 0
+                for submission in batch:
+                    submission.ids = ids[start:start + len(submission.tasks)]
+                    start += len(submission.tasks)
+            with self._cond:
+                self.queued -= size
+            for submission in batch:
+                submission.done.set()
+            if ids and self.on_commit:
+                self.on_commit(ids)
+
+    def close(self):
+        """Commits what is already queued, then stops the writer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+
+def validate_task(task):
+    """
+    Checks a submitted task and returns it as a new pending task.
+
+    Raises:
+        ValueError: If the task is malformed.
+    """
+    if not isinstance(task, dict):
+        raise ValueError("a task must be a JSON object")
+    if not isinstance(task.get("task"), str) or not task["task"].strip():
+        raise ValueError("'task' must be a non-empty string")
+    if "id" in task:
+        raise ValueError("task ids are assigned by the server")
+    for flag in ("execute", "skip_auditor"):
+        if flag in task and not isinstance(task[flag], bool):
+            raise ValueError(f"'{flag}' must be true or false")
+    priority = task.get("priority")
+    if priority is not None:
+        is_number = isinstance(priority, (int, float)) and not isinstance(priority, bool) and math.isfinite(priority)
+        if not is_number and not (isinstance(priority, str) and priority.lower() in PRIORITY_RANKS):
+            raise ValueError("'priority' must be \"high\", \"medium\", \"low\" or a number")
+    depends_on = task.get("depends_on")
+    if depends_on is not None:
+        # Task ids are assigned by the server, so dependencies are integers
+        dependencies = depends_on if isinstance(depends_on, list) else [depends_on]
+        if not all(isinstance(dep, int) and not isinstance(dep, bool) for dep in dependencies):
+            raise ValueError("'depends_on' must be a task id or a list of task ids")
+    return dict(task, status="pending")
+
+
+class TaskAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        store = self.server.store
+        match = TASK_PATH_RE.match(url.path)
+        if match:
+            task = store.get_task(int(match.group(1)))
+            if task is None:
+                self.send_json(404, {"error": f"No task {match.group(1)}"})
+            else:
+                self.send_json(200, task)
+        elif url.path == "/tasks":
+            query = parse_qs(url.query)
+            if "ids" in query:
+                try:
+                    ids = [int(value) for value in ",".join(query["ids"]).split(",") if value]
+                except ValueError:
+                    self.send_json(400, {"error": "'ids' must be comma-separated integers"})
+                    return
+                tasks = [task for task in map(store.get_task, ids) if task is not None]
+            else:
+                tasks = store.get_tasks(query.get("status", [None])[0])
+            self.send_json(200, {"tasks": tasks})
+        elif url.path == "/stats":
+            self.send_json(200, self.server.stats())
+        else:
+            self.send_json(404, {"error": f"Unknown path {url.path}"})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if path not in ("/tasks", "/tasks/batch"):
+            self.send_json(404, {"error": f"Unknown path {path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            self.send_json(413, {"error": f"Request body exceeds {MAX_BODY} bytes"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+            if path == "/tasks":
+                tasks = [validate_task(body)]
+            else:
+                if not isinstance(body, dict) or not isinstance(body.get("tasks"), list) or not body["tasks"]:
+                    raise ValueError("expected {\"tasks\": [...]} with at least one task")
+                tasks = [validate_task(task) for task in body["tasks"]]
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError too
+            self.send_json(400, {"error": str(e)})
+            return
+
+        submission = self.server.submit(tasks)
+        if submission is None:
+            self.send_json(429, {"error": "Task queue is full; retry later", **self.server.stats()},
+                           headers={"Retry-After": "1"})
+            return
+        if not submission.done.wait(COMMIT_TIMEOUT) or submission.error:
+            self.send_json(503, {"error": submission.error or "Timed out storing the tasks"})
+            return
+        if path == "/tasks":
+            self.send_json(202, {"id": submission.ids[0], "status": "pending"})
+        else:
+            self.send_json(202, {"ids": submission.ids, "status": "pending"})
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TaskAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default listen backlog of 5 resets connections from bursts of producers
+    request_queue_size = 128
+
+    def __init__(self, store, host="127.0.0.1", port=API_PORT, capacity=1000, max_pending=None, on_commit=None):
+        """
+        Local HTTP/JSON API for submitting and polling tasks, backed by the SQLite task store.
+
+        POST /tasks           one task ({"task": ..., "priority": ..., ...}) -> 202 {"id": ...}
+        POST /tasks/batch     {"tasks": [...]}, stored all-or-nothing -> 202 {"ids": [...]}
+        GET  /tasks/<id>      one task with its current status
+        GET  /tasks?ids=1,2   several tasks; GET /tasks?status=pending filters by status
+        GET  /stats           queue and backlog sizes
+
+        Submissions are answered with 429 and Retry-After while the submission queue is full,
+        or while `max_pending` tasks are already waiting to be processed.
+
+        Args:
+            store (TaskStore): Task store shared with the orchestrator (or another process).
+            capacity (int): Tasks that may wait to be committed to the store.
+            max_pending (int): Refuse submissions while this many tasks are pending (default: no limit).
+            on_commit (callable): Called with the ids of newly stored tasks, e.g. to wake a watcher.
+        """
+        super().__init__((host, port), TaskAPIHandler)
+        self.store = store
+        self.max_pending = max_pending
+        self.queue = SubmissionQueue(store, capacity=capacity, on_commit=on_commit)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stats(self):
+        return {"queued": self.queue.queued, "capacity": self.queue.capacity,
+                "pending": self.store.count("pending"), "max_pending": self.max_pending}
+
+    def submit(self, tasks):
+        """Queues tasks for the writer, or returns None to signal backpressure."""
+        if self.max_pending is not None and self.store.count("pending") + self.queue.queued + len(tasks) > self.max_pending:
+            return None
+        return self.queue.offer(tasks)
+
+    def start(self):
+        """Serves from a background thread and returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Task API listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.queue.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the HTTP task submission API on a SQLite task store.")
+    parser.add_argument("--db", default=TASK_DB, help=f"SQLite database path (default: {TASK_DB})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"Port to listen on (default: {API_PORT})")
+    parser.add_argument("--capacity", type=int, default=1000, help="Submitted tasks that may wait to be stored")
+    parser.add_argument("--max-pending", type=int, default=None, help="Answer 429 while this many tasks are pending")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    store = TaskStore(args.db)
+    server = TaskAPIServer(store, args.host, args.port, capacity=args.capacity, max_pending=args.max_pending)
+    logger.info(f"Task API listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.queue.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 import json
 import os
+import threading
+from agents.scheduler import TaskScheduler
 
 # File where tasks are stored
 TASK_FILE = "tasks.json"
 
+# Guards read-modify-write cycles on TASK_FILE when tasks run concurrently
+tasks_lock = threading.RLock()
+
 def load_tasks():
     """
     Load tasks from the JSON file.
@@ -23,8 +28,10 @@ def save_tasks(tasks):
     Args:
         tasks (dict): A dictionary containing the tasks to be saved.
     """
-    with open(TASK_FILE, "w") as f:
+    tmp_file = f"{TASK_FILE}.tmp"
+    with open(tmp_file, "w") as f:
         json.dump(tasks, f, indent=4)
+    os.replace(tmp_file, TASK_FILE)
 
 def add_task(task):
     """
@@ -33,22 +40,24 @@ def add_task(task):
     Args:
         task (dict): A dictionary representing the task to be added.
     """
-    tasks = load_tasks()
-    tasks.setdefault("tasks", []).append(task)
-    save_tasks(tasks)
+    with tasks_lock:
+        tasks = load_tasks()
+        tasks.setdefault("tasks", []).append(task)
+        save_tasks(tasks)
 
 def get_next_task():
     """
-    Get the next pending task.
+    Get the next pending task: the highest-priority one whose dependencies have succeeded.
     
     Returns:
         dict or None: The next pending task if available, otherwise None.
     """
-    tasks = load_tasks()
-    for task in tasks.get("tasks", []):
+    tasks = load_tasks().get("tasks", [])
+    scheduler = TaskScheduler(tasks)
+    for task in tasks:
         if task.get("status") == "pending":
-            return task
-    return None
+            scheduler.push(task)
+    return scheduler.pop()
 
 def mark_task_done(task_id):
     """
@@ -57,8 +66,9 @@ def mark_task_done(task_id):
     Args:
         task_id (int): The ID of the task to be marked as completed.
     """
-    tasks = load_tasks()
-    for task in tasks.get("tasks", []):
-        if task.get("id") == task_id:
-            task["status"] = "completed"
-    save_tasks(tasks)
+    with tasks_lock:
+        tasks = load_tasks()
+        for task in tasks.get("tasks", []):
+            if task.get("id") == task_id:
+                task["status"] = "completed"
+        save_tasks(tasks)
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import threading
+
+# Journal of per-task pipeline progress, read back to resume an interrupted run
+PROGRESS_FILE = ".cache/task_progress.jsonl"
+
+# Stages in pipeline order; "finished" entries carry the task's final status
+STAGES = ("generated", "audited", "finished")
+
+
+def task_fingerprint(task):
+    """Hash of the task fields that shape its output; progress recorded for other values is stale."""
+    fields = {key: task.get(key) for key in ("task", "file_name", "skip_auditor", "execute")}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class ProgressJournal:
+    def __init__(self, path=PROGRESS_FILE):
+        """
+        Append-only journal of the last completed stage of each task, with its artifact.
+
+        Each entry is one JSON line written and fsynced as soon as a stage completes, so a
+        killed run loses at most the stages that were in flight. The last entry per task
+        wins; a torn final line from a crash is ignored.
+
+        Args:
+            path (str): JSON lines file (created if missing).
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.entries[entry["task"]] = entry
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def get(self, task):
+        """
+        Returns the last recorded progress of a task, or None when there is none or it no
+        longer applies: the task was edited since, or its script was deleted.
+        """
+        with self._lock:
+            entry = self.entries.get(task.get("id"))
+        if entry is None or entry.get("fingerprint") != task_fingerprint(task):
+            return None
+        if entry["stage"] != "finished" and not os.path.exists(entry.get("script") or ""):
+            return None
+        return entry
+
+    def record(self, task, stage, **fields):
+        """Durably records that `task` completed `stage` (e.g. script=path, or status= for "finished")."""
+        entry = {"task": task.get("id"), "stage": stage, "fingerprint": task_fingerprint(task)}
+        entry.update(fields)
+        with self._lock:
+            self.entries[entry["task"]] = entry
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def discard(self, task_ids):
+        """Drops the entries of tasks whose state is saved elsewhere, compacting the journal."""
+        task_ids = set(task_ids)
+        with self._lock:
+            if not task_ids & self.entries.keys():
+                return
+            for task_id in task_ids:
+                self.entries.pop(task_id, None)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def clear(self):
+        """Forgets all recorded progress."""
+        with self._lock:
+            task_ids = list(self.entries)
+        self.discard(task_ids)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,248 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+# Database holding task state when the SQLite store is used
+TASK_DB = "tasks.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE TABLE IF NOT EXISTS imported (
+    source_key TEXT PRIMARY KEY,
+    task_id INTEGER NOT NULL
+);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def is_row_id(task_id):
+    """Whether a task id can be used as the store's integer primary key."""
+    return isinstance(task_id, int) and not isinstance(task_id, bool)
+
+
+def source_id_key(task_id):
+    """Import key of a tasks.json id; non-integer ids are JSON-encoded so "1" and 1 differ."""
+    return f"id:{task_id}" if is_row_id(task_id) else f"id:{json.dumps(task_id, sort_keys=True)}"
+
+
+def import_keys(tasks):
+    """
+    Stable identities for the tasks of a tasks.json file: "id:<id>" for tasks with an id, and
+    a hash of the content (plus an occurrence number for identical copies) for tasks without one.
+    """
+    keys = []
+    seen = {}
+    for task in tasks:
+        if task.get("id") is not None:
+            keys.append(source_id_key(task["id"]))
+            continue
+        content = {key: value for key, value in task.items() if key != "status"}
+        digest = hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+        seen[digest] = seen.get(digest, 0) + 1
+        keys.append(f"sha256:{digest}#{seen[digest]}")
+    return keys
+
+
+class TaskStore:
+    def __init__(self, db_path=TASK_DB):
+        """
+        SQLite-backed task store. Each task is one row, so status updates touch a single
+        row instead of rewriting every task, and each write is its own transaction.
+
+        Args:
+            db_path (str): Path to the SQLite database (created if missing).
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def _to_task(row):
+        task_id, status, data = row
+        task = json.loads(data)
+        task["id"] = task_id
+        task["status"] = status
+        return task
+
+    @staticmethod
+    def _to_row(task):
+        data = {key: value for key, value in task.items() if key not in ("id", "status")}
+        return task.get("status", "pending"), json.dumps(data)
+
+    def add_task(self, task):
+        """
+        Add a new task. A task without an id is given the next free one.
+
+        Returns:
+            int: The id of the stored task.
+        """
+        status, data = self._to_row(task)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO tasks (id, status, data) VALUES (?, ?, ?)",
+                (task.get("id"), status, data),
+            )
+            return cursor.lastrowid
+
+    def add_tasks(self, tasks):
+        """
+        Adds several tasks in one transaction; either all of them are stored or none.
+
+        Returns:
+            list: The ids of the stored tasks, in order.
+        """
+        ids = []
+        with self._lock, self._conn:
+            for task in tasks:
+                status, data = self._to_row(task)
+                cursor = self._conn.execute(
+                    "INSERT INTO tasks (id, status, data) VALUES (?, ?, ?)",
+                    (task.get("id"), status, data),
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def get_task(self, task_id):
+        """Returns the task with the given id, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT id, status, data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._to_task(row) if row else None
+
+    def get_tasks(self, status=None):
+        """Returns all tasks, or only those with the given status, in id order."""
+        with self._lock:
+            if status is None:
+                rows = self._conn.execute("SELECT id, status, data FROM tasks ORDER BY id").fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT id, status, data FROM tasks WHERE status = ? ORDER BY id", (status,)
+                ).fetchall()
+        return [self._to_task(row) for row in rows]
+
+    def count(self, status=None):
+        with self._lock:
+            if status is None:
+                return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM tasks WHERE status = ?", (status,)).fetchone()[0]
+
+    def update_status(self, task_id, status):
+        """Sets the status of one task."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE tasks SET status = ? WHERE id = ?", (status, task_id))
+
+    def update_task(self, task):
+        """Replaces every field of an existing task."""
+        status, data = self._to_row(task)
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE tasks SET status = ?, data = ? WHERE id = ?", (status, data, task["id"]))
+
+    def import_json(self, json_path):
+        """
+        Imports tasks from a tasks.json file. Every task is imported once: the store remembers
+        which tasks.json entries it has seen (by id, or by content for tasks without one), so
+        re-importing never duplicates tasks or overwrites progress. A task whose id is already
+        used by a task from elsewhere (e.g. the HTTP API), or is not an integer, is stored under
+        a new id, and the `depends_on` lists of imported tasks are translated to the new ids.
+
+        Returns:
+            int: Number of tasks imported.
+        """
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, "r") as f:
+            tasks = json.load(f).get("tasks", [])
+        added = []
+        # Integer ids go first, so new ids given to other tasks cannot take theirs
+        entries = sorted(zip(tasks, import_keys(tasks)), key=lambda entry: not is_row_id(entry[0].get("id")))
+        with self._lock, self._conn:
+            for task, key in entries:
+                if self._conn.execute("SELECT 1 FROM imported WHERE source_key = ?", (key,)).fetchone():
+                    continue
+                status, data = self._to_row(task)
+                task_id = task.get("id")
+                if task_id is not None and not is_row_id(task_id):
+                    logger.info(f"Task id {task_id!r} from {json_path} is not an integer; "
+                                f"storing the task under a new id.")
+                    task_id = None
+                if task_id is not None:
+                    row = self._conn.execute("SELECT data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+                    if row and row[0] == data:
+                        # Imported before the store kept track of imports
+                        self._conn.execute("INSERT INTO imported (source_key, task_id) VALUES (?, ?)",
+                                           (key, task_id))
+                        continue
+                    if row:
+                        logger.warning(f"Task id {task_id} from {json_path} is already taken; "
+                                       f"storing the task under a new id.")
+                        task_id = None
+                cursor = self._conn.execute(
+                    "INSERT INTO tasks (id, status, data) VALUES (?, ?, ?)", (task_id, status, data)
+                )
+                self._conn.execute("INSERT INTO imported (source_key, task_id) VALUES (?, ?)",
+                                   (key, cursor.lastrowid))
+                added.append((task, cursor.lastrowid))
+            for task, task_id in added:
+                if task.get("depends_on") is not None:
+                    self._translate_dependencies(task, task_id)
+        return len(added)
+
+    def _translate_dependencies(self, task, task_id):
+        """Rewrites an imported task's `depends_on` from tasks.json ids to store ids."""
+        depends_on = task["depends_on"]
+        deps = depends_on if isinstance(depends_on, list) else [depends_on]
+        translated = []
+        for dep in deps:
+            try:
+                row = self._conn.execute("SELECT task_id FROM imported WHERE source_key = ?",
+                                         (source_id_key(dep),)).fetchone()
+            except TypeError:
+                # Not JSON-serialisable; the scheduler reports it
+                row = None
+            translated.append(row[0] if row else dep)
+        if translated != deps:
+            task = dict(task, depends_on=translated if isinstance(depends_on, list) else translated[0])
+            self._conn.execute("UPDATE tasks SET data = ? WHERE id = ?", (self._to_row(task)[1], task_id))
+
+    def export_json(self, json_path):
+        """Writes all tasks to a tasks.json file, atomically replacing it."""
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"tasks": self.get_tasks()}, f, indent=4)
+        os.replace(tmp_path, json_path)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move tasks between tasks.json and the SQLite task store.")
+    parser.add_argument("command", choices=["import", "export"], help="import tasks.json into the store, or export it back")
+    parser.add_argument("--json", default="tasks.json", help="tasks.json path (default: tasks.json)")
+    parser.add_argument("--db", default=TASK_DB, help=f"SQLite database path (default: {TASK_DB})")
+    args = parser.parse_args()
+
+    store = TaskStore(args.db)
+    if args.command == "import":
+        print(f"Imported {store.import_json(args.json)} tasks into {args.db}.")
+    else:
+        store.export_json(args.json)
+        print(f"Exported {store.count()} tasks to {args.json}.")
+    store.close()
+
+if __name__ == "__main__":
+    main()
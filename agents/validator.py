@@ -0,0 +1,73 @@
+import ast
+import importlib.util
+import logging
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+ValidationResult = namedtuple("ValidationResult", ["ok", "errors"])
+
+
+@lru_cache(maxsize=None)
+def module_available(name):
+    """Returns True if a top-level module can be imported in this environment (without importing it)."""
+    if name in sys.builtin_module_names or name in getattr(sys, "stdlib_module_names", ()):
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def top_level_imports(tree):
+    """
+    Yields (line, module) for the unconditional module-level imports of a parsed script.
+    Imports inside try/if blocks are skipped: they are usually optional dependencies.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield node.lineno, alias.name.split(".")[0]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            yield node.lineno, node.module.split(".")[0]
+
+
+def validate_script(script_path):
+    """
+    Fast in-process checks run before a generated script is audited or executed:
+    it must parse, compile, and its top-level imports must resolve.
+
+    Returns:
+        ValidationResult: ok flag and a list of human-readable errors.
+    """
+    try:
+        with open(script_path, "r", encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return ValidationResult(False, [f"Cannot read script: {e}"])
+
+    if not source.strip():
+        return ValidationResult(False, ["Script is empty."])
+
+    try:
+        tree = ast.parse(source, filename=script_path)
+        # compile() catches errors ast.parse lets through, e.g. 'return' outside a function
+        compile(tree, script_path, "exec")
+    except SyntaxError as e:
+        return ValidationResult(False, [f"line {e.lineno}: SyntaxError: {e.msg}"])
+    except ValueError as e:
+        return ValidationResult(False, [f"Compile error: {e}"])
+
+    # The script runs with its own directory on sys.path, so sibling modules count as available
+    script_dir = os.path.dirname(os.path.abspath(script_path))
+    errors = []
+    for lineno, module in top_level_imports(tree):
+        local = os.path.exists(os.path.join(script_dir, f"{module}.py")) or \
+            os.path.isdir(os.path.join(script_dir, module))
+        if not local and not module_available(module):
+            errors.append(f"line {lineno}: ImportError: module '{module}' is not installed")
+
+    for error in errors:
+        logging.error(f"Validation of {script_path}: {error}")
+    return ValidationResult(not errors, errors)
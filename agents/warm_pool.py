@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from agents.executor import ExecutionResult
+from agents.sandbox import rlimit_settings
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "warm_worker.py")
+
+
+class WarmWorker:
+    def __init__(self, preload=()):
+        """
+        A long-lived interpreter that has already imported `preload` and forks a child per script.
+        """
+        self.preload = list(preload)
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", WORKER_SCRIPT, json.dumps(self.preload)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def run(self, script_path, timeout=None, limits=None):
+        """
+        Sends one script to the worker and waits for its reply.
+
+        Returns:
+            dict: The worker's reply (see sandbox.supervise).
+        """
+        request = {
+            "path": os.path.abspath(script_path),
+            "timeout": timeout,
+            "limits": rlimit_settings(limits),
+            "output_bytes": limits.output_bytes if limits else None,
+        }
+        self.process.stdin.write(json.dumps(request) + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"warm worker exited with code {self.process.wait()}")
+        return json.loads(line)
+
+    def close(self):
+        if self.alive():
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+class WarmInterpreterPool:
+    def __init__(self, size=2, preload=(), limits=None):
+        """
+        Pool of pre-started Python interpreters for running generated scripts.
+
+        Each worker imports the `preload` modules once at start-up. A script runs in a forked child
+        of a warm worker, so it skips interpreter start-up and those imports, and still gets a fresh
+        process that cannot leak state into the next script. Forking requires a POSIX system;
+        elsewhere each script runs in a new interpreter, as execute_script does without a pool.
+
+        Args:
+            size (int): Number of warm workers, i.e. how many scripts can run at the same time.
+            preload (iterable): Module names imported by every worker ahead of time.
+            limits (SandboxLimits): Resource and output limits for every script run (None: only the timeout).
+        """
+        self.size = max(1, size)
+        self.preload = list(preload)
+        self.limits = limits
+        self.forking = hasattr(os, "fork")
+        self.logger = logging.getLogger(__name__)
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        if self.forking:
+            for _ in range(self.size):
+                self._start_worker()
+
+    def _start_worker(self):
+        worker = WarmWorker(self.preload)
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _retire_worker(self, worker):
+        worker.close()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def run(self, script_path, timeout=10, limits=None):
+        """
+        Runs a script on a warm worker, waiting for a free worker if all are busy.
+
+        Args:
+            script_path (str): Script to run; it sees itself as __main__ with its directory on sys.path.
+            timeout (float): Seconds before the run is killed.
+            limits (SandboxLimits): Overrides the pool's limits for this run.
+
+        Returns:
+            ExecutionResult: Exit code, captured output, timing and truncation counts.
+        """
+        if self._closed:
+            raise RuntimeError("WarmInterpreterPool is closed")
+        limits = limits or self.limits
+        if not self.forking:
+            return self._run_cold(script_path, timeout)
+
+        worker = self._idle.get()
+        try:
+            reply = worker.run(script_path, timeout, limits)
+        except (OSError, RuntimeError, ValueError) as e:
+            # The worker itself died; replace it so the pool keeps its size
+            self.logger.error(f"Warm worker failed while running {script_path}: {e}")
+            self._retire_worker(worker)
+            if not self._closed:
+                self._start_worker()
+            return ExecutionResult(-1, "", str(e), False, 0.0, 0.0, 0)
+        self._idle.put(worker)
+
+        if "error" in reply:
+            return ExecutionResult(-1, "", reply["error"], False, 0.0, 0.0, 0)
+        return ExecutionResult(**reply)
+
+    def _run_cold(self, script_path, timeout):
+        start = time.monotonic()
+        try:
+            result = subprocess.run([sys.executable, script_path], capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            return ExecutionResult(-9, e.stdout or "", e.stderr or "", True, time.monotonic() - start, 0.0, 0)
+        return ExecutionResult(result.returncode, result.stdout, result.stderr, False,
+                               time.monotonic() - start, 0.0, 0)
+
+    def close(self):
+        """Stops all workers. Runs already in progress finish first."""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,92 @@
+"""
+Warm interpreter worker used by agents/warm_pool.py.
+
+The worker imports the preload modules once, then reads one JSON request per line on stdin
+and answers with one JSON line on stdout. Each script runs in a forked child, so it starts
+with every preloaded module already imported but cannot affect the worker or later scripts.
+This file runs as a standalone script; besides the standard library it only uses the
+sibling sandbox module.
+"""
+import importlib
+import json
+import os
+import runpy
+import sys
+import traceback
+
+# sys.path[0] is this directory: take the sandbox helpers, then drop the directory and the module
+# so neither can shadow modules imported by the scripts
+from sandbox import apply_limits, supervise  # noqa: E402
+sys.modules.pop("sandbox", None)
+sys.path.pop(0)
+
+
+def run_child(request, stdout_fd, stderr_fd):
+    """Runs in the forked child: apply limits, redirect output, run the script, never return."""
+    code = 0
+    try:
+        os.setsid()
+        os.dup2(os.open(os.devnull, os.O_RDONLY), 0)  # stdin is the request pipe
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        apply_limits(request.get("limits", []))
+        path = request["path"]
+        sys.argv = [path]
+        sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def run_request(request):
+    """Forks a child for one script and supervises it (see sandbox.supervise)."""
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(out_r)
+        os.close(err_r)
+        run_child(request, out_w, err_w)
+    os.close(out_w)
+    os.close(err_w)
+    return supervise(pid, out_r, err_r, timeout=request.get("timeout"), output_bytes=request.get("output_bytes"))
+
+
+def serve(preload):
+    # Replies go to a private copy of stdout; stray prints from preloaded modules go nowhere
+    replies = os.fdopen(os.dup(1), "w")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"warm worker: cannot preload {name}: {e}", file=sys.stderr)
+
+    for line in sys.stdin:
+        try:
+            reply = run_request(json.loads(line))
+        except Exception as e:
+            reply = {"error": f"{type(e).__name__}: {e}"}
+        replies.write(json.dumps(reply) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    serve(json.loads(sys.argv[1]) if len(sys.argv) > 1 else [])
@@ -0,0 +1,263 @@
+"""
+Offline benchmarks for the pipeline: context compression and generation, static analysis,
+script execution and full TaskOrchestrator runs against a local fake OpenAI server.
+
+Inputs are synthetic and seeded, so results from different commits are comparable:
+
+    python benchmarks/bench_pipeline.py --json before.json
+    (check out another commit)
+    python benchmarks/bench_pipeline.py --baseline before.json
+
+Usage:
+    python benchmarks/bench_pipeline.py --tasks 40 --workers 4 --latency 300 --jitter 100
+    python benchmarks/bench_pipeline.py --only compress context --files 200
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+# The reviewer and the OpenAI clients read their key when first created; any value works offline
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from fake_openai_server import SCRIPT_TEMPLATE, FakeOpenAIServer
+from synthetic import make_repo, make_tasks
+
+from agents.metrics import load_events, percentile, summarize_events
+
+SECTIONS = ["compress", "context", "static", "execute", "orchestrator"]
+
+
+def latency_stats(samples, items=None):
+    """Summarizes per-item latencies (seconds) as milliseconds plus throughput."""
+    total = sum(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "per_second": round((items or len(samples)) / total, 3) if total else None,
+    }
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silences the pipeline's prints and info logging while a benchmark runs."""
+    logging.disable(logging.WARNING)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def bench_compress(args, repo_files):
+    from context_generator import compress_code, skeleton_code
+    from context_selector import estimate_tokens
+
+    sources = []
+    for path in repo_files:
+        with open(path, "r", encoding="utf-8") as f:
+            sources.append(f.read())
+    size_mb = sum(len(source.encode("utf-8")) for source in sources) / 1e6
+    source_tokens = sum(estimate_tokens(source) for source in sources)
+    results = {}
+    for name, compress in (("shorthand", compress_code), ("skeleton", skeleton_code)):
+        samples = []
+        tokens = 0
+        for source in sources:
+            elapsed, compressed = timed(compress, source)
+            samples.append(elapsed)
+            tokens += estimate_tokens(compressed)
+        stats = latency_stats(samples)
+        stats["mb_per_second"] = round(size_mb / sum(samples), 3)
+        stats["token_ratio"] = round(tokens / source_tokens, 3)
+        results[name] = stats
+    return results
+
+
+def bench_context(args, repo_root):
+    from context_generator import generate_context
+
+    output = os.path.join(repo_root, os.pardir, "context.txt")
+    full, _ = timed(generate_context, repo_root, output, incremental=True, jobs=args.jobs)
+    unchanged, _ = timed(generate_context, repo_root, output, incremental=True, jobs=args.jobs)
+    touched = os.path.join(repo_root, "pkg0", "module_0.py")
+    with open(touched, "a", encoding="utf-8") as f:
+        f.write("\n# touched\n")
+    one_changed, _ = timed(generate_context, repo_root, output, incremental=True, jobs=args.jobs)
+    return {
+        "full_s": round(full, 4),
+        "incremental_unchanged_s": round(unchanged, 4),
+        "incremental_one_changed_s": round(one_changed, 4),
+        "context_mb": round(os.path.getsize(output) / 1e6, 3),
+    }
+
+
+def bench_static(args, repo_files):
+    from agents.code_auditor import run_static_analysis
+
+    samples = [timed(run_static_analysis, path)[0] for path in repo_files]
+    return latency_stats(samples)
+
+
+def write_scripts(directory, count):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"bench_script_{i}.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(SCRIPT_TEMPLATE.format(iterations=1000 + i, tag=i))
+        paths.append(path)
+    return paths
+
+
+def bench_execute(args, workdir):
+    from agents.executor import execute_script, execute_scripts
+    from agents.warm_pool import WarmInterpreterPool
+
+    scripts = write_scripts(os.path.join(workdir, "exec_scripts"), args.scripts)
+    results = {"sequential": latency_stats([timed(execute_script, path)[0] for path in scripts])}
+    batch, _ = timed(execute_scripts, scripts, max_workers=args.exec_workers)
+    results["batch_scripts_per_second"] = round(len(scripts) / batch, 3)
+    if args.warm_pool:
+        with WarmInterpreterPool(args.warm_pool) as pool:
+            results["warm_pool"] = latency_stats([timed(execute_script, path, pool=pool)[0] for path in scripts])
+    return results
+
+
+def bench_orchestrator(args, workdir, server):
+    from task_orchestrator import TaskOrchestrator
+    from openai_script_extract import configure_client_limits
+    from response_cache import configure_default_cache
+
+    configure_default_cache(enabled=False)
+    configure_client_limits(requests_per_minute=args.rpm, tokens_per_minute=args.tpm, backoff_base=args.backoff)
+    if not os.path.exists("context.txt"):
+        from context_generator import generate_context
+        generate_context(os.path.join(workdir, "repo"), "context.txt")
+    make_tasks("tasks.json", args.tasks, execute_ratio=args.execute_ratio, audit_ratio=args.audit_ratio,
+               seed=args.seed)
+    metrics_file = os.path.join(workdir, "logs", "bench_metrics.jsonl")
+    with server:
+        orchestrator = TaskOrchestrator(workers=args.workers, stream=args.stream, execution_workers=args.exec_workers,
+                                        metrics_file=metrics_file)
+        elapsed, _ = timed(orchestrator.run)
+        requests = server.request_count
+
+    statuses = {}
+    for task in orchestrator.tasks:
+        statuses[task["status"]] = statuses.get(task["status"], 0) + 1
+    summary = summarize_events(load_events(metrics_file))
+    return {
+        "wall_s": round(elapsed, 3),
+        "tasks_per_second": round(args.tasks / elapsed, 3),
+        "llm_requests": requests,
+        "retries": summary["counters"].get("retries", 0),
+        "statuses": statuses,
+        "tokens": summary["tokens"],
+        "stages": {stage: {key: stats[key] for key in ("count", "p50", "p95", "max")}
+                   for stage, stats in summary["stages"].items()},
+    }
+
+
+def flatten(results, prefix=""):
+    """Yields (dotted.name, value) for every number in a nested results dict."""
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, f"{name}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+def print_results(results, baseline=None):
+    previous = dict(flatten(baseline)) if baseline else {}
+    for name, value in flatten(results):
+        line = f"{name:<55}{value:>14}"
+        old = previous.get(name)
+        if old:
+            line += f"{old:>14}{value / old:>9.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline offline with synthetic inputs.")
+    parser.add_argument("--only", nargs="+", choices=SECTIONS, default=SECTIONS, help="Sections to run")
+    parser.add_argument("--files", type=int, default=100, help="Modules in the synthetic repository (default: 100)")
+    parser.add_argument("--functions", type=int, default=8, help="Functions per synthetic module (default: 8)")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for context generation")
+    parser.add_argument("--scripts", type=int, default=10, help="Scripts for the execution benchmark (default: 10)")
+    parser.add_argument("--warm-pool", type=int, default=0, help="Also time execution on a warm pool of N workers")
+    parser.add_argument("--tasks", type=int, default=20, help="Tasks in the synthetic tasks.json (default: 20)")
+    parser.add_argument("--workers", type=int, default=4, help="Orchestrator workers (default: 4)")
+    parser.add_argument("--exec-workers", type=int, default=None, help="Concurrent script executions")
+    parser.add_argument("--execute-ratio", type=float, default=0.5, help="Fraction of tasks that execute their script")
+    parser.add_argument("--audit-ratio", type=float, default=0.0, help="Fraction of tasks that are audited")
+    parser.add_argument("--stream", action="store_true", help="Stream LLM responses")
+    parser.add_argument("--latency", type=float, default=200, help="Fake server time to first token, ms")
+    parser.add_argument("--jitter", type=float, default=50, help="Fake server latency jitter, ms")
+    parser.add_argument("--tokens-per-second", type=float, default=400, help="Fake server generation speed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake server 429 responses")
+    parser.add_argument("--rpm", type=float, default=10**6, help="Client request rate limit (default: unthrottled)")
+    parser.add_argument("--tpm", type=float, default=10**9, help="Client token rate limit (default: unthrottled)")
+    parser.add_argument("--backoff", type=float, default=0.05, help="Client retry backoff base, seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for all synthetic inputs")
+    parser.add_argument("--json", default=None, help="Write the results to this file")
+    parser.add_argument("--baseline", default=None, help="Results file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    # Bound before anything creates an OpenAI client, so every client picks up its URL
+    server = FakeOpenAIServer(latency=args.latency / 1000, jitter=args.jitter / 1000,
+                              tokens_per_second=args.tokens_per_second, error_rate=args.error_rate, seed=args.seed)
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="finn_bench_") as workdir:
+        # The pipeline works relative to the current directory (tasks.json, scripts/, logs/, .cache/)
+        os.chdir(workdir)
+        try:
+            repo_root = os.path.join(workdir, "repo")
+            repo_files = make_repo(repo_root, args.files, args.functions, seed=args.seed)
+            with quiet():
+                for section in args.only:
+                    if section == "compress":
+                        results[section] = bench_compress(args, repo_files)
+                    elif section == "context":
+                        results[section] = bench_context(args, repo_root)
+                    elif section == "static":
+                        results[section] = bench_static(args, repo_files)
+                    elif section == "execute":
+                        results[section] = bench_execute(args, workdir)
+                    elif section == "orchestrator":
+                        results[section] = bench_orchestrator(args, workdir, server)
+        finally:
+            os.chdir(cwd)
+
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
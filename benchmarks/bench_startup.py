@@ -0,0 +1,92 @@
+"""
+Measures start-up cost: wall time of short CLI invocations and the import time of the main
+modules, using `python -X importtime` to show which imports dominate.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 5 --top 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_tasks
+
+# name -> argv after the interpreter; run from a directory holding a synthetic tasks.json
+COMMANDS = {
+    "python -c pass": ["-c", "pass"],
+    "import task_orchestrator": ["-c", "import task_orchestrator"],
+    "import main": ["-c", "import main"],
+    "task_summary.py": [os.path.join(ROOT, "task_summary.py")],
+    "main.py --dry-run": [os.path.join(ROOT, "main.py"), "--dry-run"],
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parses `-X importtime` output.
+
+    Returns:
+        list: (cumulative microseconds, self microseconds, module) for every import.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        imports.append((int(cumulative_us), int(self_us), module.rstrip()))
+    return imports
+
+
+def run(argv, cwd, importtime=False):
+    env = dict(os.environ, PYTHONPATH=ROOT, OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "benchmark"))
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + argv
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} failed:\n{result.stderr}")
+    return elapsed, result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI start-up and import times.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command; the fastest is reported (default: 5)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports (two levels deep) to list per command")
+    parser.add_argument("--json", default=None, help="Write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="finn_startup_") as workdir:
+        make_tasks(os.path.join(workdir, "tasks.json"), 50)
+        for name, argv in COMMANDS.items():
+            wall = min(run(argv, workdir)[0] for _ in range(args.repeat))
+            _, stderr = run(argv, workdir, importtime=True)
+            imports = parse_importtime(stderr)
+            # The module column is indented two spaces per nesting level; keep the first two levels
+            shallow = sorted((i for i in imports if not i[2].startswith("     ")), reverse=True)
+            results[name] = {
+                "wall_ms": round(wall * 1000, 1),
+                "import_ms": round(sum(i[1] for i in imports) / 1000, 1),
+                "slowest_imports": [(module.strip(), round(cumulative / 1000, 1))
+                                    for cumulative, _, module in shallow[:args.top]],
+            }
+
+    for name, result in results.items():
+        print(f"{name:<28}wall {result['wall_ms']:>8.1f} ms   imports {result['import_ms']:>8.1f} ms")
+        for module, ms in result["slowest_imports"]:
+            print(f"    {module:<40}{ms:>8.1f} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
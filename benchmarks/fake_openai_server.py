@@ -0,0 +1,229 @@
+"""
+Local OpenAI-compatible chat completions server for offline benchmarks.
+
+Answers POST /v1/chat/completions with a small, valid Python script in a ```python block
+(or an empty ```diff block for diff-mode reviews), after a configurable latency with jitter
+and a simulated generation speed. Supports "stream": true (server-sent events), reports
+token usage, and can inject 429 responses to exercise retries.
+
+Usage:
+    python benchmarks/fake_openai_server.py --port 8765 --latency 300 --jitter 100
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python main.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCRIPT_TEMPLATE = '''import math
+
+
+def main():
+    total = sum(math.sqrt(i) for i in range({iterations}))
+    print(f"task {tag}: {{total:.3f}}")
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+PROSE = "This script computes a sum of square roots and prints it. "
+
+
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+def build_reply(prompt, prose_sentences=8):
+    """Deterministic reply for a prompt: a script block (or empty diff) followed by some prose."""
+    if "```diff block" in prompt:
+        return "No changes are needed.\n```diff\n```\n"
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    script = SCRIPT_TEMPLATE.format(iterations=1000 + int(digest[:4], 16) % 1000, tag=digest[:8])
+    return f"Here is the script:\n```python\n{script}```\n\n{PROSE * prose_sentences}"
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        server.count_request()
+
+        time.sleep(server.first_token_delay())
+        if server.rng_random() < server.error_rate:
+            self.send_json(429, {"error": {"message": "Rate limit reached (injected)", "type": "rate_limit"}},
+                           headers={"Retry-After": "0"})
+            return
+
+        prompt = "\n".join(m.get("content") or "" for m in body.get("messages", []))
+        reply = build_reply(prompt, server.prose_sentences)
+        max_tokens = body.get("max_tokens")
+        if max_tokens:
+            reply = reply[:max_tokens * 4]
+        model = body.get("model", "fake-model")
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            self.stream_reply(reply, model, prompt if include_usage else None)
+            return
+
+        time.sleep(estimate_tokens(reply) / server.tokens_per_second)
+        self.send_json(200, {
+            "id": f"chatcmpl-{server.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": estimate_tokens(prompt),
+                "completion_tokens": estimate_tokens(reply),
+                "total_tokens": estimate_tokens(prompt) + estimate_tokens(reply),
+            },
+        })
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def stream_reply(self, reply, model, prompt=None):
+        """
+        Sends the reply as server-sent events, a few tokens per chunk at the simulated speed. With
+        the prompt, a final chunk reports the usage, as the API does for stream_options.include_usage.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        chunk_chars = 16
+        delay = chunk_chars / 4 / self.server.tokens_per_second
+        try:
+            for start in range(0, len(reply), chunk_chars):
+                event = {
+                    "id": f"chatcmpl-{self.server.request_count}",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": reply[start:start + chunk_chars]},
+                                 "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                self.server.count_chunk()
+                time.sleep(delay)
+            if prompt is not None:
+                usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(reply),
+                         "total_tokens": estimate_tokens(prompt) + estimate_tokens(reply)}
+                event = {"id": f"chatcmpl-{self.server.request_count}", "object": "chat.completion.chunk",
+                         "created": int(time.time()), "model": model, "choices": [], "usage": usage}
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading, e.g. once the Python block was complete
+            pass
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.2, jitter=0.05, tokens_per_second=200.0,
+                 error_rate=0.0, prose_sentences=8, seed=0):
+        """
+        Args:
+            latency (float): Seconds before the first token.
+            jitter (float): Uniform +/- jitter added to the latency, in seconds.
+            tokens_per_second (float): Simulated generation speed.
+            error_rate (float): Fraction of requests answered with 429.
+            prose_sentences (int): Sentences of prose after the code block (output streaming can skip).
+            seed (int): Seed for jitter and error injection.
+        """
+        super().__init__((host, port), FakeOpenAIHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.prose_sentences = prose_sentences
+        self.request_count = 0
+        self.chunk_count = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def rng_random(self):
+        with self._lock:
+            return self._rng.random()
+
+    def first_token_delay(self):
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    def count_request(self):
+        with self._lock:
+            self.request_count += 1
+
+    def count_chunk(self):
+        with self._lock:
+            self.chunk_count += 1
+
+    def start(self):
+        """Serves from a background thread and returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible chat completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=200, help="Time to first token in ms (default: 200)")
+    parser.add_argument("--jitter", type=float, default=50, help="Latency jitter in ms (default: 50)")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="Simulated generation speed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.host, args.port, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                              tokens_per_second=args.tokens_per_second, error_rate=args.error_rate)
+    print(f"Fake OpenAI server on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic inputs for the benchmarks: Python repositories and tasks.json files of any size.
+Everything is generated from a seed, so runs on different commits see identical inputs.
+"""
+import json
+import os
+import random
+
+WORDS = ["data", "item", "user", "record", "value", "config", "cache", "report", "task", "node",
+         "buffer", "stream", "queue", "result", "index", "token", "batch", "event", "state", "model"]
+
+
+def _name(rng, parts=2):
+    return "_".join(rng.choice(WORDS) for _ in range(parts))
+
+
+def make_module(rng, functions=8):
+    """Source of one synthetic module: imports, a class and some functions with docstrings and branches."""
+    lines = ["import os", "import json", "from collections import defaultdict", "", ""]
+    class_name = "".join(word.title() for word in _name(rng).split("_"))
+    lines += [
+        f"class {class_name}:",
+        f'    """Holds {_name(rng, 3).replace("_", " ")} state."""',
+        "",
+        "    def __init__(self, path, limit=10):",
+        "        self.path = path",
+        "        self.limit = limit",
+        "        self.items = defaultdict(list)",
+        "",
+        "    def load(self):",
+        "        if not os.path.exists(self.path):",
+        "            return None",
+        "        with open(self.path) as f:",
+        "            return json.load(f)",
+        "",
+        "",
+    ]
+    for _ in range(functions):
+        name = _name(rng, 3)
+        arg = rng.choice(WORDS)
+        lines += [
+            f"def {name}({arg}s, threshold=None):",
+            f'    """Returns the {arg}s that are not None and above the threshold."""',
+            "    result = []",
+            f"    for {arg} in {arg}s:",
+            f"        if {arg} is not None and (threshold is None or {arg} > threshold):",
+            f"            result.append({arg})",
+            f"        elif {arg} is None:",
+            "            continue",
+            "    return result",
+            "",
+            "",
+        ]
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def make_repo(root, files=50, functions=8, seed=0):
+    """
+    Writes `files` synthetic modules into packages under root.
+
+    Returns:
+        list: Paths of the written files.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for i in range(files):
+        package = os.path.join(root, f"pkg{i % 5}")
+        os.makedirs(package, exist_ok=True)
+        path = os.path.join(package, f"module_{i}.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_module(rng, functions))
+        paths.append(path)
+    return paths
+
+
+def make_tasks(path, count=20, execute_ratio=0.5, audit_ratio=0.0, seed=0):
+    """
+    Writes a tasks.json with `count` pending tasks.
+
+    Args:
+        execute_ratio (float): Fraction of tasks with execute: true.
+        audit_ratio (float): Fraction of tasks that go through the auditor.
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(1, count + 1):
+        tasks.append({
+            "id": i,
+            "task": f"Write a script that processes {_name(rng, 2).replace('_', ' ')} records ({i}).",
+            "priority": rng.choice(["high", "medium", "low"]),
+            "status": "pending",
+            "execute": rng.random() < execute_ratio,
+            "skip_auditor": rng.random() >= audit_ratio,
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"tasks": tasks}, f, indent=4)
+    return tasks
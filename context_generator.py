@@ -1,6 +1,10 @@
+import argparse
+import ast
+import hashlib
 import os
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
 from agents.logger import setup_logging
 import logging
 
@@ -44,19 +48,138 @@ SHORTHAND_MAP = {
     " nonlocal ": "η"
 }
 
+class ShorthandEngine:
+    """
+    Applies a shorthand mapping in a single pass over the code.
+
+    The result is identical to calling str.replace once per mapping entry, in mapping order:
+    matches are found with one trie-shaped regex, and where occurrences overlap (e.g. "is not"
+    sharing a space between " is " and " not ") the earlier mapping entry wins, as it would
+    with sequential replacement.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        self.priority = {pattern: index for index, pattern in enumerate(self.mapping)}
+        patterns = list(self.mapping)
+        # Single-pass matching relies on one pattern matching per position, and on replacements
+        # never forming new matches; otherwise fall back to sequential replacement.
+        self.sequential = any(
+            other != pattern and other.startswith(pattern)
+            for pattern in patterns for other in patterns
+        ) or any(
+            ch in pattern for pattern in patterns for shorthand in self.mapping.values() for ch in shorthand
+        )
+        self.regex = re.compile(self._trie_pattern(patterns)) if patterns else None
+        # Offsets inside each pattern where another occurrence could start and overlap it
+        self.overlaps = {
+            pattern: tuple(
+                offset for offset in range(1, len(pattern))
+                if any(other.startswith(pattern[offset:]) or pattern[offset:].startswith(other) for other in patterns)
+            )
+            for pattern in patterns
+        }
+
+    @staticmethod
+    def _trie_pattern(words):
+        """Builds a regex that matches any of words by walking a character trie."""
+        trie = {}
+        for word in words:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+
+        def emit(node):
+            alternatives = [re.escape(ch) + emit(child) if ch else "" for ch, child in sorted(node.items())]
+            if len(alternatives) == 1:
+                return alternatives[0]
+            return "(?:" + "|".join(alternatives) + ")"
+
+        return emit(trie)
+
+    def apply(self, code):
+        if self.sequential or self.regex is None:
+            for pattern, shorthand in self.mapping.items():
+                code = code.replace(pattern, shorthand)
+            return code
+
+        mapping = self.mapping
+        overlaps = self.overlaps
+        match_at = self.regex.match
+        pieces = []
+        pos = 0
+        for m in self.regex.finditer(code):
+            start = m.start()
+            if start < pos:
+                # Already handled as part of an overlapping cluster
+                continue
+            pattern = m.group()
+            if not any(match_at(code, start + offset) for offset in overlaps[pattern]):
+                pieces.append(code[pos:start])
+                pieces.append(mapping[pattern])
+                pos = m.end()
+                continue
+            pos = self._apply_cluster(code, start, pattern, pos, pieces)
+        pieces.append(code[pos:])
+        return "".join(pieces)
+
+    def _apply_cluster(self, code, start, pattern, pos, pieces):
+        """
+        Resolves a run of overlapping occurrences the way sequential replacement would.
+        Appends the output up to the end of the run and returns that position.
+        """
+        candidates = {start: pattern}
+        todo = [(start, pattern)]
+        while todo:
+            cand_start, cand_pattern = todo.pop()
+            for offset in self.overlaps[cand_pattern]:
+                m = self.regex.match(code, cand_start + offset)
+                if m and m.start() not in candidates:
+                    candidates[m.start()] = m.group()
+                    todo.append((m.start(), m.group()))
+
+        accepted = []
+        for cand_start, cand_pattern in sorted(candidates.items(), key=lambda c: (self.priority[c[1]], c[0])):
+            cand_end = cand_start + len(cand_pattern)
+            if all(cand_end <= acc_start or cand_start >= acc_end for acc_start, acc_end, _ in accepted):
+                accepted.append((cand_start, cand_end, cand_pattern))
+
+        for acc_start, acc_end, acc_pattern in sorted(accepted):
+            pieces.append(code[pos:acc_start])
+            pieces.append(self.mapping[acc_pattern])
+            pos = acc_end
+        cluster_end = max(cand_start + len(cand_pattern) for cand_start, cand_pattern in candidates.items())
+        pieces.append(code[pos:cluster_end])
+        return cluster_end
+
+SHORTHAND_ENGINE = ShorthandEngine(SHORTHAND_MAP)
+
+# "shorthand" keeps whole files with SHORTHAND_MAP symbols substituted; "skeleton" keeps only
+# each module's outline (see skeleton_code) and needs no lookup table
+COMPRESSION_MODES = ("shorthand", "skeleton")
+# Bump when skeleton_code's output changes, so cached skeletons are rebuilt
+SKELETON_VERSION = 1
+# Longest module or class level assignment kept verbatim in a skeleton
+MAX_ASSIGNMENT_CHARS = 80
+
+def apply_shorthand(code):
+    """Replaces every SHORTHAND_MAP pattern in code with its shorthand symbol."""
+    return SHORTHAND_ENGINE.apply(code)
+
 def compress_code1(code):
     # Remove commented lines (lines that start with '#')
     lines = code.splitlines()
     filtered_lines = [line for line in lines if not line.strip().startswith("#")]
     code = "\n".join(filtered_lines)
     
-    for pattern, shorthand in SHORTHAND_MAP.items():
-        code = code.replace(pattern, shorthand)
+    code = apply_shorthand(code)
     # Refine docstring handling: preserve content between docstring markers
     code = re.sub(r'@DOC(.*?)@DOC', lambda m: f'@DOC {m.group(1).strip()}', code, flags=re.DOTALL)
     return code
 
-def compress_code(code):
+def condense_code(code):
+    """Drops comment and blank lines and condenses whitespace after the indentation."""
     # Split code into lines
     lines = code.splitlines()
     # Filter out comment lines and remove trailing whitespace from each line
@@ -72,11 +195,13 @@ def compress_code(code):
         leading = len(line) - len(line.lstrip())
         return " " * leading + " ".join(line.split())
     
-    code = "\n".join(condense_spaces(line) for line in code.splitlines())
-    
+    return "\n".join(condense_spaces(line) for line in code.splitlines())
+
+def compress_code(code):
+    code = condense_code(code)
+
     # Apply shorthand replacements
-    for pattern, shorthand in SHORTHAND_MAP.items():
-        code = code.replace(pattern, shorthand)
+    code = apply_shorthand(code)
     
     # Refine docstring handling: preserve content between docstring markers
     code = re.sub(r'@DOC(.*?)@DOC', lambda m: f'@DOC {m.group(1).strip()}', code, flags=re.DOTALL)
@@ -84,6 +209,87 @@ def compress_code(code):
     return code
 
 
+def _docstring_line(node):
+    """First sentence of a module, class or function docstring as a one-line docstring, or None."""
+    docstring = ast.get_docstring(node)
+    if not docstring or not docstring.strip():
+        return None
+    # Summaries often wrap, so join the first paragraph before cutting it at the first sentence
+    paragraph = " ".join(line.strip() for line in docstring.strip().split("\n\n")[0].splitlines())
+    end = paragraph.find(". ")
+    summary = paragraph[:end + 1] if end != -1 else paragraph
+    return '"""' + summary.replace('"""', "'''") + '"""'
+
+def _signature_lines(node):
+    """Decorators and the def/class line of a definition."""
+    lines = [f"@{ast.unparse(decorator)}" for decorator in node.decorator_list]
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(base) for base in node.bases + node.keywords]
+        lines.append(f"class {node.name}({', '.join(bases)}):" if bases else f"class {node.name}:")
+    else:
+        prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+        returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+        lines.append(f"{prefix} {node.name}({ast.unparse(node.args)}){returns}:")
+    return lines
+
+def _assignment_line(node):
+    """An assignment verbatim when it is short, otherwise with its value elided."""
+    text = ast.unparse(node)
+    if "\n" not in text and len(text) <= MAX_ASSIGNMENT_CHARS:
+        return text
+    if isinstance(node, ast.AnnAssign):
+        return f"{ast.unparse(node.target)}: {ast.unparse(node.annotation)} = ..."
+    return f"{' = '.join(ast.unparse(target) for target in node.targets)} = ..."
+
+def _skeleton_lines(body, body_lines, indent=""):
+    lines = []
+    for node in body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            lines.append(indent + ast.unparse(node))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            lines.append(indent + _assignment_line(node))
+        elif isinstance(node, ast.ClassDef):
+            lines += [indent + line for line in _signature_lines(node)]
+            docstring = _docstring_line(node)
+            members = ([indent + "    " + docstring] if docstring else []) + \
+                _skeleton_lines(node.body, body_lines, indent + "    ")
+            lines += members or [indent + "    ..."]
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if body_lines and node.end_lineno - node.lineno + 1 <= body_lines:
+                lines += [indent + line for line in ast.unparse(node).splitlines()]
+                continue
+            lines += [indent + line for line in _signature_lines(node)]
+            docstring = _docstring_line(node)
+            if docstring:
+                lines.append(indent + "    " + docstring)
+            lines.append(indent + "    ...")
+    return lines
+
+def skeleton_code(code, body_lines=0):
+    """
+    Reduces a module to its outline: imports, short assignments, class and function signatures
+    (with decorators) and the first line of each docstring, with bodies replaced by `...`.
+    String literals are left untouched, so the result is plain Python that needs no lookup table.
+
+    Args:
+        body_lines (int): Functions spanning at most this many lines are kept whole (0: none).
+
+    Returns:
+        str: The skeleton, or the condensed source if the module does not parse.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return condense_code(code)
+    docstring = _docstring_line(tree)
+    return "\n".join(([docstring] if docstring else []) + _skeleton_lines(tree.body, body_lines))
+
+def compress_source(code, mode="shorthand", body_lines=0):
+    """Compresses one module's source with the given compression mode."""
+    if mode == "skeleton":
+        return skeleton_code(code, body_lines)
+    return compress_code(code)
+
 def is_valid_py_file(filepath):
     """
     Determine if the file is a valid Python file for context aggregation.
@@ -93,46 +299,202 @@ def is_valid_py_file(filepath):
     parts = set(filepath.split(os.sep))
     return filepath.endswith('.py') and not parts.intersection(invalid_dirs)
 
-def generate_context(root_dir, output_file):
+def iter_py_files(root_dir, exclude_dirs=()):
     """
-    Recursively reads all .py files from root_dir (excluding unwanted directories)
-    and writes their compressed content into output_file with headers indicating the source file.
+    Yields the .py files under root_dir in the order they appear in the context file.
+    `exclude_dirs` are further directories to skip, relative to root_dir (e.g. generated output).
     """
-    aggregated_content = []
     invalid_dirs = {'.git', '__pycache__', 'venv', 'env'}
-
-    # Prepend the shorthand lookup table
-    lookup_header = "// SHORTHAND LOOKUP\n" + json.dumps(SHORTHAND_MAP, indent=4) + "\n\n"
-    aggregated_content.append(lookup_header)
-
+    excluded = {os.path.normpath(os.path.join(root_dir, d)) for d in exclude_dirs}
     for dirpath, dirnames, filenames in os.walk(root_dir):
         # Filter out unwanted directories
-        dirnames[:] = [d for d in dirnames if d not in invalid_dirs]
+        dirnames[:] = [d for d in dirnames
+                       if d not in invalid_dirs and os.path.normpath(os.path.join(dirpath, d)) not in excluded]
         for filename in sorted(filenames):
             if filename.endswith('.py'):
                 full_path = os.path.join(dirpath, filename)
                 if is_valid_py_file(full_path):
-                    try:
-                        with open(full_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-                        compressed_content = compress_code(content)
-                        header = f"\n# --- {os.path.relpath(full_path, root_dir)} ---\n"
-                        aggregated_content.append(header)
-                        aggregated_content.append(compressed_content)
-                        aggregated_content.append("\n")
-                        logger.info(f"Added {full_path} to context.")
-                    except Exception as e:
-                        logger.error(f"Error reading {full_path}: {e}")
+                    yield full_path
+
+def format_fragment(rel_path, compressed_content):
+    """Formats one file's compressed content as it appears in the context file."""
+    header = f"\n# --- {rel_path} ---\n"
+    return "\n".join([header, compressed_content, "\n"])
+
+def compressor_version(mode="shorthand", body_lines=0):
+    """Identifies the compression settings; cached fragments from other settings are discarded."""
+    if mode == "skeleton":
+        settings = {"mode": mode, "skeleton_version": SKELETON_VERSION, "body_lines": body_lines}
+    else:
+        settings = SHORTHAND_MAP
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+def default_manifest_file(output_file):
+    return os.path.splitext(output_file)[0] + ".manifest.json"
+
+def manifest_version(manifest_file):
+    """Returns the compressor version a manifest was built with, or None if there is no readable one."""
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            return json.load(f).get("version")
+    except (OSError, ValueError):
+        return None
+
+def load_manifest(manifest_file, version=None):
+    """Loads the incremental manifest, returning an empty one if missing, unreadable or stale."""
+    if version is None:
+        version = compressor_version()
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == version:
+            return manifest
+        logger.info("Context manifest was built with different settings; rebuilding.")
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.error(f"Error reading manifest {manifest_file}: {e}")
+    return {"version": version, "files": {}}
+
+def save_manifest(manifest, manifest_file):
+    """Writes the manifest atomically so an interrupted run never leaves it half-written."""
+    tmp_file = f"{manifest_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_file, manifest_file)
+
+# Digests whose compressed output the parent process already has; set once per worker process
+_known_digests = frozenset()
+
+def _init_worker(known_digests):
+    global _known_digests
+    _known_digests = known_digests
+
+def read_and_compress(full_path, known_digests=None, mode="shorthand", body_lines=0):
+    """
+    Reads a file and returns (sha256 of its bytes, content compressed with `mode`).
+    Compression is skipped, and None returned in its place, for digests in known_digests.
+    Module-level so it can run in a worker process.
+    """
+    if known_digests is None:
+        known_digests = _known_digests
+    with open(full_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest in known_digests:
+        return digest, None
+    return digest, compress_source(raw.decode("utf-8"), mode, body_lines)
+
+def generate_context(root_dir, output_file, incremental=False, manifest_file=None, jobs=1, mode="shorthand",
+                     body_lines=0, exclude_dirs=()):
+    """
+    Recursively reads all .py files from root_dir (excluding unwanted directories)
+    and writes their compressed content into output_file with headers indicating the source file.
+
+    In incremental mode a manifest of per-file mtime, size, content hash and compressed output
+    is kept next to output_file, and only new or changed files are read and recompressed.
+    Files that disappeared are dropped from the manifest; renamed files reuse their cached output.
+
+    With jobs > 1, files are read and compressed in a pool of that many processes;
+    the output is identical to a serial run.
+
+    `mode` is "shorthand" (whole files with SHORTHAND_MAP substitutions, preceded by the lookup
+    table) or "skeleton" (per-module outlines from skeleton_code, keeping the bodies of functions
+    of at most `body_lines` lines). Directories in `exclude_dirs` (relative to root_dir) are skipped.
+    """
+    if mode not in COMPRESSION_MODES:
+        raise ValueError(f"Unknown compression mode {mode!r}; expected one of {COMPRESSION_MODES}")
+    if manifest_file is None:
+        manifest_file = default_manifest_file(output_file)
+    version = compressor_version(mode, body_lines)
+    old_files = load_manifest(manifest_file, version)["files"] if incremental else {}
+    cached_by_hash = {entry["sha256"]: entry["compressed"] for entry in old_files.values()}
+    files = {}
+    fragments = []
+    recompressed = 0
+
+    # Decide up front which files need reading so they can be handed to the pool together
+    candidates = []
+    for full_path in iter_py_files(root_dir, exclude_dirs):
+        rel_path = os.path.relpath(full_path, root_dir)
+        try:
+            stat = os.stat(full_path)
+        except OSError as e:
+            logger.error(f"Error reading {full_path}: {e}")
+            continue
+        entry = old_files.get(rel_path)
+        if not (entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size):
+            entry = None
+        candidates.append((rel_path, full_path, stat, entry))
+
+    stale = [full_path for _, full_path, _, entry in candidates if entry is None]
+    pool = None
+    futures = {}
+    if jobs > 1 and len(stale) > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                   initargs=(frozenset(cached_by_hash),))
+        futures = {full_path: pool.submit(read_and_compress, full_path, mode=mode, body_lines=body_lines)
+                   for full_path in stale}
+
+    try:
+        # Results are consumed in walk order, so the output does not depend on completion order
+        for rel_path, full_path, stat, entry in candidates:
+            try:
+                if entry is None:
+                    if pool:
+                        digest, compressed_content = futures[full_path].result()
+                    else:
+                        digest, compressed_content = read_and_compress(full_path, cached_by_hash, mode, body_lines)
+                    if compressed_content is None:
+                        compressed_content = cached_by_hash[digest]
+                    else:
+                        cached_by_hash[digest] = compressed_content
+                        recompressed += 1
+                    entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest,
+                             "compressed": compressed_content}
+                files[rel_path] = entry
+                fragments.append(format_fragment(rel_path, entry["compressed"]))
+                logger.info(f"Added {full_path} to context.")
+            except Exception as e:
+                logger.error(f"Error reading {full_path}: {e}")
+    finally:
+        if pool:
+            pool.shutdown()
+
+    # Prepend the shorthand lookup table; skeletons are plain Python and need none
+    if mode == "shorthand":
+        fragments.insert(0, "// SHORTHAND LOOKUP\n" + json.dumps(SHORTHAND_MAP, indent=4) + "\n\n")
 
     try:
         with open(output_file, "w", encoding="utf-8") as out_file:
-            out_file.write("\n".join(aggregated_content))
+            out_file.write("\n".join(fragments))
         logger.info(f"Context file '{output_file}' created successfully.")
     except Exception as e:
         logger.error(f"Error writing to {output_file}: {e}")
 
+    if incremental:
+        logger.info(f"Incremental context: {recompressed} of {len(files)} files recompressed.")
+        try:
+            save_manifest({"version": version, "files": files}, manifest_file)
+        except Exception as e:
+            logger.error(f"Error writing manifest {manifest_file}: {e}")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate compressed project sources into a context file.")
+    parser.add_argument("--root", default=".", help="Project root directory (default: current directory)")
+    parser.add_argument("--output", default=None, help="Context file to write (default: <root>/context.txt)")
+    parser.add_argument("--incremental", action="store_true", help="Only recompress files changed since the last run")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes for compression (0: one per CPU)")
+    parser.add_argument("--mode", choices=COMPRESSION_MODES, default="shorthand",
+                        help="shorthand: whole files with symbol substitution; skeleton: imports, signatures "
+                             "and docstring first lines only (default: shorthand)")
+    parser.add_argument("--body-lines", type=int, default=0,
+                        help="In skeleton mode, keep the bodies of functions of at most N lines (default: 0)")
+    args = parser.parse_args()
+
     # Set the project root directory; adjust if needed.
-    project_root = os.path.abspath(".")
-    context_file = os.path.join(project_root, "context.txt")
-    generate_context(project_root, context_file)
+    project_root = os.path.abspath(args.root)
+    context_file = args.output or os.path.join(project_root, "context.txt")
+    jobs = args.jobs or os.cpu_count() or 1
+    generate_context(project_root, context_file, incremental=args.incremental, jobs=jobs, mode=args.mode,
+                     body_lines=args.body_lines)
@@ -0,0 +1,128 @@
+import codecs
+import logging
+import mmap
+import os
+import threading
+import time
+
+from context_selector import ContextSelector
+
+logger = logging.getLogger(__name__)
+
+
+class ContextProvider:
+    def __init__(self, context_file, source_root=None, use_mmap=False, check_interval=2.0, mode="shorthand",
+                 body_lines=0, exclude_dirs=()):
+        """
+        Loads a context file once and shares it between tasks until the file changes.
+
+        Args:
+            context_file (str): Context file written by generate_context.
+            source_root (str): When set, the context is regenerated (incrementally) whenever
+                .py files under this directory change.
+            use_mmap (bool): Read the file through mmap instead of a buffered read.
+            check_interval (float): Minimum seconds between scans of source_root (math.inf scans
+                once, on first use, only to bring a stale context up to date).
+            mode (str): Compression mode used when regenerating ("shorthand" or "skeleton"; see
+                context_generator.generate_context).
+            body_lines (int): In skeleton mode, functions of at most this many lines keep their body.
+            exclude_dirs (tuple): Directories under source_root that are not part of the context,
+                such as generated scripts.
+        """
+        self.context_file = context_file
+        self.source_root = source_root
+        self.use_mmap = use_mmap
+        self.check_interval = check_interval
+        self.mode = mode
+        self.body_lines = body_lines
+        self.exclude_dirs = tuple(exclude_dirs)
+        self.version = 0
+        self._text = None
+        self._stat = None
+        self._selector = None
+        self._sources = None
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Returns the current context. Every caller gets the same immutable string
+        object, so concurrent workers share it without copying.
+        """
+        with self._lock:
+            if self.source_root:
+                self._refresh_sources()
+            stat = os.stat(self.context_file)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._text is None or signature != self._stat:
+                self._text = self._read()
+                self._stat = signature
+                self._selector = None
+                self.version += 1
+                logger.info(f"Loaded context from {self.context_file} ({stat.st_size} bytes).")
+            return self._text
+
+    def selector(self):
+        """Returns a ContextSelector for the current context, rebuilt only when the context changes."""
+        text = self.get()
+        with self._lock:
+            if self._selector is None or self._selector[0] is not text:
+                self._selector = (text, ContextSelector(text))
+            return self._selector[1]
+
+    def _read(self):
+        if self.use_mmap:
+            with open(self.context_file, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # Decode straight from the mapping, without an intermediate bytes copy
+                    view = memoryview(mapped)
+                    try:
+                        return codecs.utf_8_decode(view, "strict", True)[0]
+                    finally:
+                        view.release()
+        with open(self.context_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _refresh_sources(self):
+        """Regenerates the context file if source files were added, removed or modified."""
+        now = time.monotonic()
+        if self._sources is not None and now - self._last_scan < self.check_interval:
+            return
+        self._last_scan = now
+        # Imported here: context_generator configures its own log file on import
+        from context_generator import (compressor_version, default_manifest_file, generate_context, iter_py_files,
+                                       load_manifest, manifest_version)
+
+        sources = {}
+        for path in iter_py_files(self.source_root, self.exclude_dirs):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            sources[path] = (stat.st_mtime_ns, stat.st_size)
+
+        if self._sources is None:
+            # First scan: rebuild only if the context is missing or older than a source file
+            try:
+                context_mtime = os.stat(self.context_file).st_mtime_ns
+            except FileNotFoundError:
+                context_mtime = -1
+            stale = any(mtime > context_mtime for mtime, _ in sources.values())
+            # A context built in another compression mode is rebuilt too; one without a manifest
+            # is taken to be shorthand, the generator's default
+            version = manifest_version(default_manifest_file(self.context_file)) or compressor_version()
+            stale = stale or version != compressor_version(self.mode, self.body_lines)
+            # ...and so is one holding other files, e.g. generated scripts picked up before they were excluded
+            manifest = load_manifest(default_manifest_file(self.context_file), version)
+            built_from = {os.path.join(self.source_root, rel_path) for rel_path in manifest["files"]}
+            stale = stale or (bool(built_from) and built_from != set(sources))
+        else:
+            stale = sources != self._sources
+        self._sources = sources
+
+        if stale:
+            logger.info(f"Source files changed; regenerating {self.context_file}.")
+            generate_context(self.source_root, self.context_file, incremental=True, mode=self.mode,
+                             body_lines=self.body_lines, exclude_dirs=self.exclude_dirs)
@@ -0,0 +1,118 @@
+import math
+import re
+from collections import Counter, namedtuple
+
+# Matches the per-file headers written by context_generator.format_fragment
+HEADER_RE = re.compile(r"^# --- (.+) ---$", re.MULTILINE)
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9]*")
+CAMEL_RE = re.compile(r"[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])")
+
+Fragment = namedtuple("Fragment", ["path", "text", "tokens"])
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def tokenize(text):
+    """
+    Splits text into lowercase search terms. Identifiers are also split into their
+    snake_case and camelCase parts, so "TaskOrchestrator" matches "task orchestrator".
+    """
+    terms = []
+    for word in WORD_RE.findall(text):
+        parts = CAMEL_RE.findall(word)
+        terms.append(word.lower())
+        if len(parts) > 1:
+            terms.extend(part.lower() for part in parts)
+    return terms
+
+
+def split_context(context_text):
+    """
+    Splits a context file into (preamble, fragments). The preamble is everything before the
+    first file header, i.e. the shorthand lookup table when one is present.
+    """
+    headers = list(HEADER_RE.finditer(context_text))
+    if not headers:
+        return context_text, []
+    preamble = context_text[:headers[0].start()]
+    fragments = []
+    for header, next_header in zip(headers, headers[1:] + [None]):
+        end = next_header.start() if next_header else len(context_text)
+        text = context_text[header.start():end]
+        fragments.append(Fragment(header.group(1), text, estimate_tokens(text)))
+    return preamble, fragments
+
+
+class ContextSelector:
+    def __init__(self, context_text, k1=1.5, b=0.75):
+        """
+        BM25 index over the per-file fragments of a context file.
+
+        Args:
+            context_text (str): Contents of a context file written by generate_context.
+            k1 (float): BM25 term-frequency saturation.
+            b (float): BM25 document-length normalisation.
+        """
+        self.preamble, self.fragments = split_context(context_text)
+        self.k1 = k1
+        self.b = b
+        self.term_counts = []
+        self.lengths = []
+        document_frequency = Counter()
+        for fragment in self.fragments:
+            # File paths count twice: a task naming a module should strongly prefer it
+            terms = tokenize(fragment.text) + tokenize(fragment.path)
+            counts = Counter(terms)
+            self.term_counts.append(counts)
+            self.lengths.append(len(terms))
+            document_frequency.update(counts.keys())
+        total = len(self.fragments)
+        self.avg_length = sum(self.lengths) / total if total else 0
+        self.idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_frequency.items()
+        }
+
+    @classmethod
+    def from_file(cls, context_file, **kwargs):
+        with open(context_file, "r", encoding="utf-8") as f:
+            return cls(f.read(), **kwargs)
+
+    def rank(self, query):
+        """
+        Scores every fragment against the query.
+
+        Returns:
+            list: (score, index) pairs with a positive score, best first.
+        """
+        query_terms = set(tokenize(query))
+        scores = []
+        for index, counts in enumerate(self.term_counts):
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[index] / (self.avg_length or 1))
+            score = 0.0
+            for term in query_terms:
+                freq = counts.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            if score > 0:
+                scores.append((score, index))
+        scores.sort(key=lambda item: (-item[0], item[1]))
+        return scores
+
+    def select(self, query, token_budget):
+        """
+        Builds a context containing the most relevant fragments that fit within token_budget.
+        The preamble (shorthand lookup table) is always kept so the fragments stay decodable,
+        and selected fragments keep their original order.
+        """
+        budget = token_budget - estimate_tokens(self.preamble)
+        chosen = []
+        for _, index in self.rank(query):
+            fragment = self.fragments[index]
+            if fragment.tokens <= budget:
+                chosen.append(index)
+                budget -= fragment.tokens
+        return self.preamble + "".join(self.fragments[index].text for index in sorted(chosen))
@@ -0,0 +1,116 @@
+import re
+from collections import namedtuple
+
+# One "@@ -a,b +c,d @@" section of a unified diff. Lines keep their " ", "-" or "+" prefix.
+Hunk = namedtuple("Hunk", ["old_start", "lines"])
+
+HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+
+class PatchError(Exception):
+    """Raised when a diff cannot be parsed or does not apply to the file."""
+
+
+def extract_fenced_block(response, language):
+    """Returns the content of the first ```<language> block of a response, or None if there is none."""
+    match = re.search(rf"```{language}[ \t]*\n(.*?)```", response, re.DOTALL)
+    return match.group(1) if match else None
+
+
+def parse_unified_diff(diff_text):
+    """
+    Parses a unified diff for a single file into hunks.
+
+    File headers (---/+++) are ignored. Hunk header line numbers are only used as hints and
+    line counts only to spot pure insertions, because model-written diffs often get them
+    wrong; a bare "@@" header is accepted and means "position unknown".
+
+    Returns:
+        list: Hunk tuples in file order.
+    """
+    hunks = []
+    current = None
+    for line in diff_text.splitlines():
+        if line.startswith("@@"):
+            match = HUNK_HEADER_RE.match(line)
+            old_start = int(match.group(1)) if match else None
+            if match and match.group(2) == "0":
+                # An empty old range names the line *after which* the new lines go
+                old_start += 1
+            current = Hunk(old_start, [])
+            hunks.append(current)
+        elif current is None:
+            # Preamble: "diff --git", "---", "+++", "index" lines or prose
+            continue
+        elif line.startswith(("--- ", "+++ ")) and not current.lines:
+            continue
+        elif line.startswith("\\"):
+            # "\ No newline at end of file"
+            continue
+        elif line[:1] in (" ", "-", "+"):
+            current.lines.append(line)
+        elif line == "":
+            # Editors and models often strip the space from empty context lines
+            current.lines.append(" ")
+        else:
+            raise PatchError(f"Unexpected line in diff: {line!r}")
+    return [hunk for hunk in hunks if hunk.lines]
+
+
+def _find_block(lines, block, hint, start, normalize):
+    """Returns the index where `block` occurs in lines[start:], preferring the one nearest `hint`."""
+    if normalize:
+        lines = [line.rstrip() for line in lines]
+        block = [line.rstrip() for line in block]
+    size = len(block)
+    candidates = [i for i in range(start, len(lines) - size + 1) if lines[i:i + size] == block]
+    if not candidates:
+        return None
+    if hint is None:
+        return candidates[0]
+    return min(candidates, key=lambda i: abs(i - hint))
+
+
+def apply_unified_diff(original, diff_text):
+    """
+    Applies a unified diff to the text of one file.
+
+    Each hunk is located by its context and removed lines, starting at the line number in its
+    header and searching the rest of the file if the number is off. Trailing whitespace is
+    ignored when there is no exact match.
+
+    Returns:
+        str: The patched text.
+
+    Raises:
+        PatchError: If the diff is empty or a hunk does not match the file.
+    """
+    hunks = parse_unified_diff(diff_text)
+    if not hunks:
+        raise PatchError("Diff contains no hunks.")
+
+    lines = original.splitlines()
+    result = []
+    position = 0
+    for number, hunk in enumerate(hunks, start=1):
+        old = [line[1:] for line in hunk.lines if line[0] in (" ", "-")]
+        new = [line[1:] for line in hunk.lines if line[0] in (" ", "+")]
+        hint = hunk.old_start - 1 if hunk.old_start else None
+        if not old:
+            # Pure insertion: the header line number is all there is to go on
+            index = max(position, min(hint if hint is not None else len(lines), len(lines)))
+        else:
+            index = _find_block(lines, old, hint, position, normalize=False)
+            if index is None:
+                index = _find_block(lines, old, hint, position, normalize=True)
+            if index is None:
+                raise PatchError(f"Hunk {number} does not match the file.")
+        result.extend(lines[position:index])
+        result.extend(new)
+        position = index + len(old)
+    result.extend(lines[position:])
+
+    patched = "\n".join(result)
+    if original.endswith("\n") or not original:
+        patched += "\n"
+    return patched
@@ -1,10 +1,106 @@
+import argparse
 import logging
+from agents.audit_policy import AuditPolicy
+from agents.sandbox import DEFAULT_LIMITS, SandboxLimits
+from openai_script_extract import configure_client_limits
+from response_cache import configure_default_cache
 from task_orchestrator import TaskOrchestrator
 
+def execution_limits(args):
+    """Builds SandboxLimits from the command line, or None when scripts run unrestricted."""
+    limits = DEFAULT_LIMITS if args.sandbox else SandboxLimits()
+    if args.cpu_limit:
+        limits = limits._replace(cpu_seconds=args.cpu_limit)
+    if args.memory_limit:
+        limits = limits._replace(memory=args.memory_limit * 1024 * 1024)
+    if args.output_limit:
+        limits = limits._replace(output_bytes=args.output_limit)
+    return limits if any(value is not None for value in limits) else None
+
 def main():
     """Main entry point for task processing."""
-    orchestrator = TaskOrchestrator()
-    orchestrator.run()
+    parser = argparse.ArgumentParser(description="Run pending tasks from tasks.json.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of tasks processed concurrently (default: 1)")
+    parser.add_argument("--checkpoint-every", type=int, default=None, help="Save tasks.json after every N finished tasks")
+    parser.add_argument("--context-budget", type=int, default=None, help="Token budget for per-task context (default: whole context.txt)")
+    parser.add_argument("--refresh-context", action="store_true", help="Regenerate context.txt when source files change mid-run")
+    parser.add_argument("--mmap", action="store_true", help="Load context.txt through mmap")
+    parser.add_argument("--context-mode", choices=["shorthand", "skeleton"], default="shorthand",
+                        help="Compression used when context.txt is regenerated: whole files with symbol substitution, "
+                             "or module skeletons (imports, signatures, docstring summaries); a context.txt in another "
+                             "mode is rebuilt once before the first task (default: shorthand)")
+    parser.add_argument("--context-body-lines", type=int, default=0,
+                        help="With --context-mode skeleton, keep the bodies of functions of at most N lines")
+    parser.add_argument("--db", default=None, help="Keep task state in this SQLite store instead of rewriting tasks.json")
+    parser.add_argument("--aging", type=int, default=100, help="Dispatches after which a ready task gains one priority level (0 disables)")
+    parser.add_argument("--stream", action="store_true", help="Stream responses and stop once the first Python block is complete")
+    parser.add_argument("--max-regenerations", type=int, default=1, help="Regenerate scripts that fail validation up to N times (default: 1)")
+    parser.add_argument("--exec-workers", type=int, default=None, help="Scripts executed concurrently (default: one per CPU)")
+    parser.add_argument("--warm-pool", type=int, default=0, help="Run scripts on N pre-started interpreters (default: 0, off)")
+    parser.add_argument("--preload", default="", help="Comma-separated modules the warm interpreters import up front")
+    parser.add_argument("--sandbox", action="store_true", help="Run scripts under default CPU, memory, file and output limits")
+    parser.add_argument("--cpu-limit", type=int, default=None, help="CPU seconds per script run")
+    parser.add_argument("--memory-limit", type=int, default=None, help="Address-space limit per script run, in MB")
+    parser.add_argument("--output-limit", type=int, default=None, help="Bytes of stdout/stderr kept per script run")
+    parser.add_argument("--review-mode", choices=["full", "diff"], default="full",
+                        help="Ask the auditor for a full rewrite or a unified diff applied locally (default: full)")
+    parser.add_argument("--audit", choices=["always", "auto"], default="always",
+                        help="'auto' only sends scripts with static analysis issues, or that are long, complex "
+                             "and not yet audited, to the LLM reviewer (default: always)")
+    parser.add_argument("--max-audit-lines", type=int, default=200, help="With --audit auto, audit clean scripts longer than this")
+    parser.add_argument("--max-complexity", type=int, default=10, help="With --audit auto, audit clean scripts more complex than this")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Discard the progress journal of an interrupted run and redo every pending task")
+    parser.add_argument("--dry-run", action="store_true", help="Show the order pending tasks would run in and exit")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and process new pending tasks as they are added to tasks.json")
+    parser.add_argument("--serve", type=int, default=None, metavar="PORT",
+                        help="With --db, accept tasks over a local HTTP API on PORT and process them as in --watch")
+    parser.add_argument("--max-pending", type=int, default=None, help="With --serve, answer 429 while N tasks are pending")
+    parser.add_argument("--watch-interval", type=float, default=2.0, help="Seconds between checks for new tasks in --watch mode")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk LLM response cache")
+    parser.add_argument("--rpm", type=int, default=None, help="LLM requests per minute across all workers (default: 500)")
+    parser.add_argument("--tpm", type=int, default=None, help="LLM tokens per minute across all workers (default: 30000)")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Concurrent LLM requests (default: 8)")
+    args = parser.parse_args()
+    if args.serve is not None and not args.db:
+        parser.error("--serve needs --db: submitted tasks are stored in the SQLite task store")
+
+    if args.no_cache:
+        configure_default_cache(enabled=False)
+    configure_client_limits(requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+                            max_in_flight=args.max_in_flight)
+
+    orchestrator = TaskOrchestrator(workers=args.workers, checkpoint_every=args.checkpoint_every,
+                                    context_budget=args.context_budget,
+                                    refresh_context=args.refresh_context or args.watch or args.serve is not None,
+                                    use_mmap=args.mmap, task_db=args.db,
+                                    aging=args.aging, stream=args.stream,
+                                    max_regenerations=args.max_regenerations,
+                                    warm_pool=args.warm_pool,
+                                    preload=[name for name in args.preload.split(",") if name],
+                                    limits=execution_limits(args),
+                                    execution_workers=args.exec_workers,
+                                    review_mode=args.review_mode,
+                                    audit_policy=AuditPolicy(max_lines=args.max_audit_lines,
+                                                             max_complexity=args.max_complexity)
+                                    if args.audit == "auto" else None,
+                                    resume=not args.no_resume,
+                                    context_mode=args.context_mode,
+                                    context_body_lines=args.context_body_lines)
+    if args.dry_run:
+        orchestrator.dry_run()
+    elif args.serve is not None:
+        from agents.task_api import TaskAPIServer
+
+        # Submissions wake the orchestrator, so new tasks start without waiting for the next poll
+        with TaskAPIServer(orchestrator.store, port=args.serve, max_pending=args.max_pending,
+                           on_commit=lambda ids: orchestrator.wake()):
+            orchestrator.watch(interval=args.watch_interval)
+    elif args.watch:
+        orchestrator.watch(interval=args.watch_interval)
+    else:
+        orchestrator.run()
 
 if __name__ == "__main__":
     main()
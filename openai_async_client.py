@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import random
+import time
+import weakref
+
+import openai
+from openai import AsyncOpenAI
+
+from agents.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def estimate_tokens(messages, max_tokens):
+    """Rough upper bound on tokens used by a request (~4 characters per token)."""
+    prompt_chars = sum(len(message["content"]) for message in messages)
+    return prompt_chars // 4 + max_tokens
+
+
+def backoff_delay(attempt, error=None, base=1.0, maximum=30.0):
+    """Full-jitter exponential backoff, honouring Retry-After when the server sends it."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), maximum)
+        except ValueError:
+            pass
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+
+def is_retryable(error):
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, capacity=None):
+        """
+        Token bucket refilled continuously at `rate_per_minute`.
+
+        Args:
+            rate_per_minute (float): Tokens added per minute.
+            capacity (float): Maximum burst size (default: one minute's worth).
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1):
+        """Wait until `amount` tokens are available and take them."""
+        # Requests larger than the bucket would wait forever; clamp them to a full bucket
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def refund(self, amount):
+        """Return unused tokens (negative values charge extra)."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AsyncLLMClient:
+    def __init__(self, api_key=None, base_url=None, requests_per_minute=500, tokens_per_minute=30000,
+                 max_in_flight=8, max_retries=5, backoff_base=1.0, backoff_max=30.0, timeout=120.0):
+        """
+        Shared async chat-completions client with rate limiting and retries.
+
+        Args:
+            api_key (str): OpenAI API key (default: OPENAI_API_KEY).
+            base_url (str): Alternative OpenAI-compatible endpoint, e.g. a local mock server.
+            requests_per_minute (int): Request budget enforced by a token bucket.
+            tokens_per_minute (int): Prompt + completion token budget enforced by a token bucket.
+            max_in_flight (int): Maximum number of concurrent requests.
+            max_retries (int): Retries on 429/5xx and connection errors.
+            backoff_base (float): Base delay in seconds for exponential backoff.
+            backoff_max (float): Upper bound for a single backoff delay.
+            timeout (float): Per-request timeout in seconds.
+        """
+        # One pooled HTTP client for every request; retries are handled here, not by the SDK
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    estimate_tokens = staticmethod(estimate_tokens)
+    is_retryable = staticmethod(is_retryable)
+
+    def backoff_delay(self, attempt, error=None):
+        return backoff_delay(attempt, error, self.backoff_base, self.backoff_max)
+
+    async def complete(self, model, messages, max_tokens=3000):
+        """
+        Sends a chat completion request, waiting for rate-limit budget and retrying transient failures.
+
+        Returns:
+            The chat completion response object.
+        """
+        estimate = self.estimate_tokens(messages, max_tokens)
+        for attempt in range(self.max_retries + 1):
+            await self.request_bucket.acquire()
+            await self.token_bucket.acquire(estimate)
+            try:
+                async with self.in_flight:
+                    response = await self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                    )
+            except Exception as e:
+                if attempt == self.max_retries or not self.is_retryable(e):
+                    raise
+                # A rejected request did not consume its token estimate
+                self.token_bucket.refund(estimate)
+                get_metrics().count("retries")
+                delay = self.backoff_delay(attempt, e)
+                logger.warning(f"LLM request failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            usage = getattr(response, "usage", None)
+            if usage is not None and usage.total_tokens is not None:
+                self.token_bucket.refund(estimate - usage.total_tokens)
+            return response
+
+    async def aclose(self):
+        await self.client.close()
+
+
+# Clients per event loop: pooled connections cannot be shared across loops
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client(api_key=None, base_url=None, **kwargs):
+    """
+    Returns the shared AsyncLLMClient for the running event loop and endpoint, creating it on first use.
+    Extra keyword arguments (rate limits, retries) are only applied when the client is created.
+    """
+    loop = asyncio.get_running_loop()
+    loop_clients = _clients.setdefault(loop, {})
+    client = loop_clients.get((api_key, base_url))
+    if client is None:
+        client = AsyncLLMClient(api_key=api_key, base_url=base_url, **kwargs)
+        loop_clients[(api_key, base_url)] = client
+    return client
@@ -1,6 +1,5 @@
 import os
 import sys
-import openai
 
 # Get the current script directory (agents/)
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,44 +10,50 @@ sys.path.append(project_root)
 
 # Now import
 from openai_script_extract import OpenAIScriptExtractor
+from diff_patch import PatchError, apply_unified_diff, extract_fenced_block
+
+REVIEW_MODES = ("full", "diff")
 
 
 class PythonCodeReviewer:
-    def __init__(self, api_key, model="gpt-4o"):
+    def __init__(self, api_key, model="gpt-4o", mode="full"):
         """
         Initialize the Python Code Reviewer.
 
         Args:
             api_key (str): Your OpenAI API key.
             model (str): OpenAI model to use (default: gpt-4o).
+            mode (str): "full" asks for the whole improved file; "diff" asks for a unified diff,
+                which is applied locally, so the response only grows with the size of the change.
         """
-        self.client = openai
-        self.client.api_key = api_key
+        if mode not in REVIEW_MODES:
+            raise ValueError(f"Unknown review mode {mode!r}; expected one of {REVIEW_MODES}.")
+        self.mode = mode
         self.model = model
         self.script_extractor = OpenAIScriptExtractor(api_key, model)
 
-    def review_and_improve_code(self, file_path):
+    def review_and_improve_code(self, file_path, diagnostics=None, mode=None):
         """
         Reviews and improves the Python code in the specified file.
 
         Args:
             file_path (str): Path to the Python file to review and improve.
+            diagnostics (list): Static analysis diagnostics to fix, as returned by run_static_analysis.
+            mode (str): Overrides the reviewer's mode for this call.
         """
         try:
             # Read the contents of the specified Python file
             with open(file_path, 'r', encoding='utf-8') as file:
                 original_code = file.read()
 
-            # Create a prompt for the OpenAI API to review and improve the code
-            prompt = f"""Review the following Python code. Provide an improved version using best practices and clean coding principles:
-
-            {original_code}
-
-            Improved Version:
-            """
+            improved_code = None
+            if (mode or self.mode) == "diff":
+                improved_code = self.review_as_diff(file_path, original_code, diagnostics)
+                if improved_code is None:
+                    print("Falling back to a full rewrite.")
 
-            # Fetch the improved script using the script extractor
-            improved_code = self.script_extractor.fetch_script(prompt)
+            if improved_code is None:
+                improved_code = self.review_as_rewrite(original_code, diagnostics)
 
             if not improved_code:
                 print("Failed to fetch the improved code from OpenAI.")
@@ -67,6 +72,70 @@ class PythonCodeReviewer:
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
 
+    def review_as_rewrite(self, original_code, diagnostics=None):
+        """
+        Asks for a complete improved version of the code.
+
+        Returns:
+            str: The improved code, or None if the response held no Python block.
+        """
+        # Create a prompt for the OpenAI API to review and improve the code
+        prompt = f"""Review the following Python code. Provide an improved version using best practices and clean coding principles:
+
+            {original_code}
+            {self.format_diagnostics(diagnostics)}
+            Improved Version:
+            """
+
+        # Fetch the improved script using the script extractor
+        return self.script_extractor.fetch_script(prompt)
+
+    def review_as_diff(self, file_path, original_code, diagnostics=None):
+        """
+        Asks for the improvements as a unified diff and applies it to the original code.
+
+        Returns:
+            str: The patched code, or None if no usable diff came back, it did not apply,
+            or the patched code does not compile.
+        """
+        name = os.path.basename(file_path)
+        prompt = f"""Review the following Python file `{name}`. Improve it using best practices and clean coding principles.
+Reply with the changes only, as a unified diff of `{name}` in a single ```diff block with 3 lines of context per hunk.
+If no changes are needed, reply with an empty ```diff block.
+
+{original_code}
+{self.format_diagnostics(diagnostics)}"""
+
+        response = self.script_extractor.fetch_completion(prompt)
+        if not response:
+            return None
+        diff_text = extract_fenced_block(response, "diff")
+        if diff_text is None:
+            print("No diff found in the response.")
+            return None
+        if not diff_text.strip():
+            print(f"Reviewer proposed no changes to '{file_path}'.")
+            return original_code
+
+        try:
+            patched = apply_unified_diff(original_code, diff_text)
+            compile(patched, file_path, "exec")
+        except PatchError as e:
+            print(f"Diff did not apply to '{file_path}': {e}")
+            return None
+        except (SyntaxError, ValueError) as e:
+            print(f"Patched '{file_path}' does not compile: {e}")
+            return None
+        return patched
+
+    @staticmethod
+    def format_diagnostics(diagnostics):
+        """Formats static analysis diagnostics as a prompt section (empty if there are none)."""
+        if not diagnostics:
+            return ""
+        lines = "\n".join(f"line {d.line}, col {d.col}: {d.code} {d.message}" for d in diagnostics)
+        return f"\nStatic analysis reported these issues, fix them:\n{lines}\n"
+
     def main(self, directory=None, file_name=None):
         """
         Main function to prompt user for file review and improvement.
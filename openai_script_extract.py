@@ -1,78 +1,392 @@
-import openai
 import os
 import re
-from openai import OpenAI, OpenAIError
+import threading
 from datetime import datetime
+from agents.metrics import get_metrics
+from response_cache import ResponseCache, get_default_cache
+
+SYSTEM_MESSAGE = "You are a helpful coding assistant."
+# Endpoint the OpenAI SDK uses when neither base_url nor OPENAI_BASE_URL is set
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+# Sync clients shared by every extractor with the same credentials, so they reuse one connection
+# pool and one set of rate limits
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+# Rate limit and retry settings for clients created from now on; see LLMClient
+_client_limits = {}
+
+
+def configure_client_limits(**limits):
+    """
+    Sets LLMClient/AsyncLLMClient arguments (e.g. requests_per_minute, max_in_flight) for shared
+    clients created later.
+    """
+    _client_limits.update({name: value for name, value in limits.items() if value is not None})
+
+
+def get_shared_client(api_key=None, base_url=None):
+    """Returns the shared rate-limited LLMClient for the given key and endpoint, creating it on first use."""
+    key = (api_key, base_url)
+    with _shared_clients_lock:
+        if key not in _shared_clients:
+            # Importing the SDK takes most of a second; only pay for it when a request is made
+            from openai_sync_client import LLMClient
+
+            _shared_clients[key] = LLMClient(api_key=api_key, base_url=base_url, **_client_limits)
+        return _shared_clients[key]
+
+
+class CodeFenceParser:
+    """
+    Incremental version of strip_response_script: fed a response piece by piece, it returns the
+    text of the first ```python block as soon as it arrives and reports when that block closes.
+    Leading and trailing whitespace is dropped, exactly as strip_response_script does.
+    """
+    FENCE = "```"
+
+    def __init__(self):
+        self.state = "outside"  # outside -> header -> python | other -> ... -> done
+        self.buffer = ""
+        self.started = False
+        self.held = ""
+        self.parts = []
+
+    @property
+    def done(self):
+        return self.state == "done"
+
+    @property
+    def script(self):
+        """The complete script once the block has closed, otherwise None."""
+        return "".join(self.parts) if self.done else None
+
+    def _emit(self, text):
+        if not self.started:
+            text = text.lstrip()
+            self.started = bool(text)
+        # Hold back trailing whitespace until more code follows it
+        text = self.held + text
+        code = text.rstrip()
+        self.held = text[len(code):]
+        if code:
+            self.parts.append(code)
+        return code
+
+    def feed(self, text):
+        """
+        Consumes the next piece of the response.
+
+        Returns:
+            str: Script text that became available with this piece (may be empty).
+        """
+        if self.done:
+            return ""
+        self.buffer += text
+        emitted = []
+        while not self.done:
+            fence = self.buffer.find(self.FENCE)
+            if self.state == "header":
+                if len(self.buffer) < len("python") and fence == -1:
+                    break
+                if self.buffer.startswith("python"):
+                    self.buffer = self.buffer[len("python"):]
+                    self.state = "python"
+                else:
+                    self.state = "other"
+                continue
+            if fence == -1:
+                # Keep a possible partial fence at the end of the buffer for the next piece
+                keep = len(self.FENCE) - 1
+                if self.state == "python" and len(self.buffer) > keep:
+                    emitted.append(self._emit(self.buffer[:-keep]))
+                self.buffer = self.buffer[-keep:]
+                break
+            if self.state == "python":
+                emitted.append(self._emit(self.buffer[:fence]))
+                self.state = "done"
+            else:
+                self.state = "header" if self.state == "outside" else "outside"
+            self.buffer = self.buffer[fence + len(self.FENCE):]
+        return "".join(emitted)
+
 
 class OpenAIScriptExtractor:
-    def __init__(self, api_key=os.getenv("OPENAI_API_KEY"), model="gpt-4o"):
+    def __init__(self, api_key=None, model="gpt-4o", base_url=None, cache=None):
         """
         Initialize the OpenAI Script Extractor.
 
         Args:
-            api_key (str): Your OpenAI API key.
+            api_key (str): Your OpenAI API key (default: OPENAI_API_KEY).
             model (str): OpenAI model to use (default: gpt-4o).
+            base_url (str): Alternative OpenAI-compatible endpoint (default: OpenAI API).
+            cache (ResponseCache): Response cache (default: the shared on-disk cache; False disables caching).
         """
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url
+        self._client = None
         self.model = model
+        self.cache = cache
+
+    @property
+    def endpoint(self):
+        """The API base URL requests go to, as the OpenAI client resolves it."""
+        return self.base_url or os.getenv("OPENAI_BASE_URL") or DEFAULT_BASE_URL
+
+    @property
+    def client(self):
+        """The shared LLMClient (rate limits and retries around the OpenAI client), created on first use."""
+        if self._client is None:
+            self._client = get_shared_client(self.api_key, self.base_url)
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    def build_messages(self, prompt):
+        """Builds the chat messages sent for a prompt."""
+        return [
+            {"role": "system", "content": SYSTEM_MESSAGE},
+            {"role": "user", "content": prompt}
+        ]
+
+    def get_cache(self):
+        """Returns the response cache in use, or None if caching is disabled."""
+        if self.cache is False:
+            return None
+        return self.cache or get_default_cache()
+
+    def lookup_cache(self, prompt, max_tokens, bypass_cache):
+        """
+        Returns (cache, key, cached script). The cached script is None on a miss or when bypassing.
+        """
+        cache = self.get_cache()
+        if cache is None:
+            return None, None, None
+        key = ResponseCache.make_key(self.model, SYSTEM_MESSAGE, prompt, max_tokens, self.endpoint)
+        if bypass_cache:
+            return cache, key, None
+        cached = cache.get(key)
+        if cached is None:
+            get_metrics().count("cache_misses")
+            return cache, key, None
+        get_metrics().count("cache_hits")
+        print("Using cached API response.")
+        return cache, key, self.strip_response_script(cached)
+
+    def handle_response(self, response, debug_file, cache=None, key=None):
+        """
+        Saves the raw response for debugging, extracts the Python script from it and caches it.
+
+        Returns:
+            str: Extracted script content or None if no Python block was found.
+        """
+        # Save raw response for debugging
+        raw_response = str(response)
+        with open(debug_file, "w") as file:
+            file.write(raw_response)
+        print(f"Raw API response saved to {debug_file}")
+
+        self.record_usage(response)
+
+        # Access content
+        message_content = response.choices[0].message.content
+        print("API Response Content:")
+        print(message_content)
+
+        script_content = self.strip_response_script(message_content)
+        if script_content is None:
+            print("No Python script found in the response. Check the raw response.")
+        elif cache is not None:
+            # Only responses that yielded a script are worth replaying
+            cache.put(key, message_content, model=self.model)
+        return script_content
 
-    def fetch_script(self, prompt, max_tokens=3000, debug_file="debug_response.txt"):
+    def fetch_script(self, prompt, max_tokens=3000, debug_file="debug_response.txt", bypass_cache=False,
+                     stream=False, output_file=None):
         """
         Fetches a script response from the OpenAI API and saves raw response for debugging.
+        Identical requests are answered from the response cache.
 
         Args:
             prompt (str): The user input prompt.
             max_tokens (int): Maximum token limit for the response.
             debug_file (str): Path to save raw API response for debugging.
+            bypass_cache (bool): Always call the API; the fresh response still replaces the cached one.
+            stream (bool): Stream the response and stop as soon as the first Python block is complete.
+            output_file (str): When streaming, write the script to this file as it arrives.
 
         Returns:
             str: Extracted script content or None if failed.
         """
         try:
+            cache, key, cached_script = self.lookup_cache(prompt, max_tokens, bypass_cache)
+            if cached_script is not None:
+                return cached_script
+
+            if stream:
+                return self.stream_script(prompt, max_tokens, debug_file, cache, key, output_file)
+
             # Fetch response from OpenAI
-            response = self.client.chat.completions.create(
+            response = self.client.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful coding assistant."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self.build_messages(prompt),
                 max_tokens=max_tokens,
             )
+            return self.handle_response(response, debug_file, cache, key)
+
+        except Exception as e:
+            get_metrics().count("api_errors")
+            print(f"Error fetching script: {e}")
+            return None
+
+    def fetch_completion(self, prompt, max_tokens=3000, debug_file="debug_response.txt", bypass_cache=False):
+        """
+        Fetches the raw text of a response, for callers that parse it themselves (e.g. diffs).
+        Responses are cached the same way as scripts.
+
+        Returns:
+            str: Response content or None if failed.
+        """
+        try:
+            cache = self.get_cache()
+            key = ResponseCache.make_key(self.model, SYSTEM_MESSAGE, prompt, max_tokens, self.endpoint) if cache else None
+            if cache is not None and not bypass_cache:
+                cached = cache.get(key)
+                if cached is not None:
+                    get_metrics().count("cache_hits")
+                    print("Using cached API response.")
+                    return cached
+                get_metrics().count("cache_misses")
 
-            # Save raw response for debugging
-            raw_response = str(response)
+            response = self.client.create(
+                model=self.model,
+                messages=self.build_messages(prompt),
+                max_tokens=max_tokens,
+            )
             with open(debug_file, "w") as file:
-                file.write(raw_response)
+                file.write(str(response))
             print(f"Raw API response saved to {debug_file}")
+            self.record_usage(response)
 
-            # Access content
             message_content = response.choices[0].message.content
-            print("API Response Content:")
-            print(message_content)
+            if cache is not None and message_content:
+                cache.put(key, message_content, model=self.model)
+            return message_content
+
+        except Exception as e:
+            get_metrics().count("api_errors")
+            print(f"Error fetching response: {e}")
+            return None
 
-            # Find all code blocks and filter for Python
-            code_blocks = re.findall(r"```(.*?)```", message_content, re.DOTALL)
-            for block in code_blocks:
-                if block.startswith("python"):
-                    script_content = block.replace("python", "", 1).strip()
-                    return script_content
+    def stream_script(self, prompt, max_tokens, debug_file, cache=None, key=None, output_file=None):
+        """
+        Streams a response, extracting the first Python block incrementally. The stream is
+        closed as soon as that block ends, so trailing prose is never generated. Token usage
+        comes from the stream's final chunk; a stream closed before it is estimated instead.
+
+        Returns:
+            str: Extracted script content or None if no Python block was found.
+        """
+        parser = CodeFenceParser()
+        content = []
+        chunks = 0
+        usage = None
+        messages = self.build_messages(prompt)
+        response = self.client.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        out = open(output_file, "w", encoding="utf-8") if output_file else None
+        try:
+            for chunk in response:
+                # The usage chunk comes last, with no choices
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                chunks += 1
+                content.append(delta)
+                code = parser.feed(delta)
+                if code and out:
+                    out.write(code)
+                    out.flush()
+                if parser.done:
+                    break
+        finally:
+            response.close()
+            if out:
+                out.close()
 
+        message_content = "".join(content)
+        with open(debug_file, "w") as file:
+            file.write(message_content)
+        print(f"Streamed API response saved to {debug_file}")
+        metrics = get_metrics()
+        metrics.record("stream", model=self.model, chunks=chunks, completion_chars=len(message_content),
+                       stopped_early=parser.done)
+        if usage is not None:
+            metrics.usage(self.model, usage.prompt_tokens, usage.completion_tokens)
+        else:
+            # Closed before the usage chunk: ~4 characters per token, as the rate limiter estimates
+            prompt_chars = sum(len(message["content"]) for message in messages)
+            metrics.usage(self.model, prompt_chars // 4, len(message_content) // 4, source="estimate")
+
+        if parser.script is None:
             print("No Python script found in the response. Check the raw response.")
             return None
+        if cache is not None:
+            # The response up to the closing fence extracts to the same script
+            cache.put(key, message_content, model=self.model)
+        return parser.script
+
+    async def afetch_script(self, prompt, max_tokens=3000, debug_file="debug_response.txt", bypass_cache=False):
+        """
+        Async version of fetch_script, for library callers running their own event loop; the
+        pipeline itself uses fetch_script from worker threads. Requests go through the shared
+        AsyncLLMClient of the running event loop, which pools connections and enforces the
+        limits set with configure_client_limits. Its budget is separate from the sync client's.
+
+        Returns:
+            str: Extracted script content or None if failed.
+        """
+        try:
+            cache, key, cached_script = self.lookup_cache(prompt, max_tokens, bypass_cache)
+            if cached_script is not None:
+                return cached_script
+
+            from openai_async_client import get_async_client
+
+            client = get_async_client(api_key=self.api_key, base_url=self.base_url, **_client_limits)
+            response = await client.complete(self.model, self.build_messages(prompt), max_tokens)
+            return self.handle_response(response, debug_file, cache, key)
 
         except Exception as e:
+            get_metrics().count("api_errors")
             print(f"Error fetching script: {e}")
             return None
 
+    def record_usage(self, response):
+        """Records the token usage the API reported for a response, if any."""
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            get_metrics().usage(self.model, getattr(usage, "prompt_tokens", None),
+                                getattr(usage, "completion_tokens", None))
+
     def strip_response_script(self, response):
-        """"""
+        """Returns the first ```python block of a response, or None if there is none."""
         # Find all code blocks and filter for Python
         code_blocks = re.findall(r"```(.*?)```", response, re.DOTALL)
         for block in code_blocks:
             if block.startswith("python"):
                 script_content = block.replace("python", "", 1).strip()
                 return script_content
-
+        return None
 
     def save_script_to_file(self, script_content, output_file):
         """
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+
+from openai import OpenAI
+
+from agents.metrics import get_metrics
+from openai_async_client import backoff_delay, estimate_tokens, is_retryable
+
+logger = logging.getLogger(__name__)
+
+
+class SyncTokenBucket:
+    def __init__(self, rate_per_minute, capacity=None):
+        """
+        Thread-safe token bucket refilled continuously at `rate_per_minute`; see TokenBucket.
+
+        Args:
+            rate_per_minute (float): Tokens added per minute.
+            capacity (float): Maximum burst size (default: one minute's worth).
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """Wait until `amount` tokens are available and take them."""
+        # Requests larger than the bucket would wait forever; clamp them to a full bucket
+        amount = min(amount, self.capacity)
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                # Woken early by refunds, otherwise when the refill should suffice
+                self._cond.wait((amount - self.tokens) / self.rate)
+
+    def refund(self, amount):
+        """Return unused tokens (negative values charge extra)."""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+            self._cond.notify_all()
+
+
+class _InFlightStream:
+    """
+    Wraps a streaming response so its in-flight slot is released once the stream is closed or
+    consumed, and `on_close` gets the usage of the final chunk (None if it was not reached).
+    """
+
+    def __init__(self, stream, release, on_close=None):
+        self._stream = stream
+        self._release = release
+        self._on_close = on_close
+        self.usage = None
+
+    def __iter__(self):
+        try:
+            for chunk in self._stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self.usage = chunk.usage
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if self._release:
+            release, self._release = self._release, None
+            try:
+                self._stream.close()
+            finally:
+                release()
+                if self._on_close:
+                    self._on_close(self.usage)
+
+
+class LLMClient:
+    def __init__(self, api_key=None, base_url=None, requests_per_minute=500, tokens_per_minute=30000,
+                 max_in_flight=8, max_retries=5, backoff_base=1.0, backoff_max=30.0, timeout=120.0):
+        """
+        Thread-safe chat-completions client with the rate limits and retries of AsyncLLMClient,
+        for the worker threads of the orchestrator. Arguments are as for AsyncLLMClient.
+        """
+        # One pooled HTTP client for every thread; retries are handled here, not by the SDK
+        self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout)
+        self.request_bucket = SyncTokenBucket(requests_per_minute)
+        self.token_bucket = SyncTokenBucket(tokens_per_minute)
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def create(self, model, messages, max_tokens=3000, **kwargs):
+        """
+        Sends a chat completion request, waiting for rate-limit budget and retrying transient
+        failures. With stream=True the request keeps its in-flight slot until the returned
+        stream is closed or exhausted.
+
+        Returns:
+            The chat completion response object, or the stream.
+        """
+        estimate = estimate_tokens(messages, max_tokens)
+        stream = kwargs.get("stream", False)
+        for attempt in range(self.max_retries + 1):
+            self.request_bucket.acquire()
+            self.token_bucket.acquire(estimate)
+            self.in_flight.acquire()
+            try:
+                response = self.client.chat.completions.create(model=model, messages=messages,
+                                                               max_tokens=max_tokens, **kwargs)
+            except Exception as e:
+                self.in_flight.release()
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                # A rejected request did not consume its token estimate
+                self.token_bucket.refund(estimate)
+                get_metrics().count("retries")
+                delay = backoff_delay(attempt, e, self.backoff_base, self.backoff_max)
+                logger.warning(f"LLM request failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            if stream:
+                return _InFlightStream(response, self.in_flight.release,
+                                       lambda usage: self.refund_unused(estimate, usage))
+            self.in_flight.release()
+            self.refund_unused(estimate, getattr(response, "usage", None))
+            return response
+
+    def refund_unused(self, estimate, usage):
+        """Returns the part of a request's token estimate its reported usage did not need."""
+        if usage is not None and usage.total_tokens is not None:
+            self.token_bucket.refund(estimate - usage.total_tokens)
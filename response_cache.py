@@ -0,0 +1,172 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(".cache", "llm")
+MAX_CACHE_BYTES = 200 * 1024 * 1024  # 200 MB
+MAX_CACHE_AGE = 7 * 24 * 60 * 60  # 7 days
+
+
+class ResponseCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_age=MAX_CACHE_AGE, enabled=True):
+        """
+        Persistent, content-addressed cache of LLM responses.
+
+        Args:
+            cache_dir (str): Directory holding one JSON file per cached response.
+            max_bytes (int): Evict least recently used entries once the cache grows past this size.
+            max_age (float): Entries older than this many seconds are treated as misses and evicted.
+            enabled (bool): When False, every lookup misses and nothing is stored.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model, system_message, prompt, max_tokens, endpoint=None):
+        """
+        Hashes everything that determines a response into a cache key. `endpoint` is the API
+        base URL, so responses from a test or proxy server are not served to real runs.
+        """
+        payload = json.dumps([model, system_message, prompt, max_tokens, endpoint], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """
+        Returns the cached response content for `key`, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                self._remove(path)
+                raise FileNotFoundError(path)
+            with open(path, "r", encoding="utf-8") as f:
+                content = json.load(f)["content"]
+            # Touch the entry so size-based eviction drops least recently used entries first
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return content
+
+    def put(self, key, content, model=None):
+        """Stores response content under `key`, evicting old entries if the cache is too large."""
+        if not self.enabled or content is None:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps({"model": model, "created": time.time(), "content": content}, ensure_ascii=False)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to write cache entry {path}: {e}")
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += len(data.encode("utf-8"))
+            over_limit = self._size > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _entries(self):
+        """Yields (path, size, mtime) for every cache entry."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Removes expired entries, then least recently used ones until the cache fits `max_bytes`."""
+        now = time.time()
+        entries = []
+        for path, size, mtime in self._entries():
+            if now - mtime > self.max_age:
+                self._remove(path)
+            else:
+                entries.append((mtime, size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        # Shrink to 90% of the limit so a full cache does not evict on every put
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+        with self._lock:
+            self._size = total
+
+    def clear(self):
+        """Removes every cache entry."""
+        for path, _, _ in self._entries():
+            self._remove(path)
+        with self._lock:
+            self._size = 0
+
+    def stats(self):
+        """Returns hit/miss counters for this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Returns the process-wide cache used by OpenAIScriptExtractor unless another one is given."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
+
+
+def configure_default_cache(**kwargs):
+    """Replaces the process-wide cache, e.g. configure_default_cache(enabled=False)."""
+    global _default_cache
+    _default_cache = ResponseCache(**kwargs)
+    return _default_cache
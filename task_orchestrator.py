@@ -1,40 +1,153 @@
 import json
 import logging
+import math
 import os
-from agents.task_manager import get_next_task, mark_task_done
-from agents.script_generator import generate_script
-from agents.code_auditor import review_and_improve
-from agents.executor import execute_script
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from agents.scheduler import TaskScheduler
+from agents.task_manager import tasks_lock
+from agents.task_store import TaskStore
+from agents.task_progress import PROGRESS_FILE, ProgressJournal
+from agents.executor import default_execution_workers
 from agents.logger import setup_logging
+from agents.metrics import METRICS_FILE, MetricsRecorder, format_summary, get_metrics, set_metrics
+from context_provider import ContextProvider
 
 TASK_FILE = "tasks.json"
 CONTEXT_FILE = "context.txt"  # File holding the aggregated context from your codebase
+# Pipeline output under the working directory (agents.script_generator.SCRIPT_DIR, caches); not project source
+GENERATED_DIRS = ("scripts", ".cache")
+
+# The generation, validation, audit and execution stages are imported where they are first used:
+# the generator and the auditor pull in the OpenAI SDK and the linters, which would otherwise make
+# every start-up (dry runs included) take the better part of a second.
 
 
 
 class TaskOrchestrator:
-    def __init__(self):
+    def __init__(self, workers=1, checkpoint_every=None, context_budget=None, refresh_context=False, use_mmap=False,
+                 task_db=None, aging=100, stream=False, max_regenerations=1, warm_pool=0, preload=(),
+                 limits=None, execution_workers=None, review_mode="full", audit_policy=None,
+                 metrics_file=METRICS_FILE, progress_file=PROGRESS_FILE, resume=True, context_mode="shorthand",
+                 context_body_lines=0):
+        """
+        Args:
+            workers (int): Number of tasks processed concurrently (default: 1, sequential).
+            checkpoint_every (int): Save tasks.json after this many finished tasks (default: only at the end).
+            context_budget (int): Token budget for the context prepended to each prompt. When set, only the
+                files most relevant to the task are included (default: the whole context).
+            refresh_context (bool): Regenerate the context when project sources change during the run.
+            use_mmap (bool): Load the context file through mmap.
+            task_db (str): SQLite task store path. When set, tasks.json is only imported from and every
+                status change is committed to the store immediately (default: read and rewrite tasks.json).
+            aging (int): Starvation protection for the priority scheduler; see TaskScheduler.
+            stream (bool): Stream LLM responses and stop generating once the first Python block is complete.
+            max_regenerations (int): How often a script that fails pre-flight validation is regenerated
+                before the task is marked invalid.
+            warm_pool (int): Run scripts on this many pre-started interpreters (default: 0, a new
+                interpreter per script).
+            preload (iterable): Modules the warm interpreters import before the first script.
+            limits (SandboxLimits): Run scripts under these CPU, memory, file and output limits
+                (default: no limits besides the timeout).
+            execution_workers (int): Scripts executed at the same time. Execution is a separate stage,
+                so workers move on to generating the next task while scripts run (default: one per CPU).
+            review_mode (str): "full" asks the auditor for a rewritten file, "diff" for a unified diff
+                that is applied locally (falling back to a full rewrite if it does not apply).
+            audit_policy (AuditPolicy): Decides which scripts are worth an LLM audit (default: audit
+                every script unless the task sets skip_auditor).
+            metrics_file (str): JSON lines file receiving per-stage timings, token usage and counters
+                for each run (None keeps them in memory; the summary is logged either way).
+            progress_file (str): Journal of each task's completed stages and script path, written as
+                stages finish so an interrupted run can be resumed (None disables it).
+            resume (bool): Pick up tasks where the journal says an interrupted run left them. False
+                discards the journal when processing starts and redoes every pending task.
+            context_mode (str): How the context is compressed when it is regenerated: "shorthand"
+                (whole files with symbol substitution) or "skeleton" (imports, signatures and
+                docstring summaries only). A context.txt in another mode is rebuilt once on first
+                use even without refresh_context.
+            context_body_lines (int): In skeleton mode, functions of at most this many lines keep
+                their body.
+        """
         setup_logging()
         self.logger = logging.getLogger(__name__)
+        self.workers = max(1, workers)
+        self.checkpoint_every = checkpoint_every
+        self.context_budget = context_budget
+        self.aging = aging
+        self.stream = stream
+        self.max_regenerations = max_regenerations
+        self.warm_pool = warm_pool
+        self.preload = list(preload)
+        self.limits = limits
+        self.execution_workers = max(1, execution_workers or default_execution_workers())
+        self.review_mode = review_mode
+        self.audit_policy = audit_policy
+        self.metrics_file = metrics_file
+        self.pool = None
+        self._status_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._saved_signature = None
+        self._imported_signature = None
+        self._stop = threading.Event()
+        # Another compression mode needs a one-time rebuild of the context even without refreshing
+        rebuild_context = refresh_context or context_mode != "shorthand"
+        self.context_provider = ContextProvider(
+            CONTEXT_FILE,
+            source_root=os.getcwd() if rebuild_context else None,
+            use_mmap=use_mmap,
+            mode=context_mode,
+            body_lines=context_body_lines,
+            # Earlier LLM output must not be fed back into later prompts as project source
+            exclude_dirs=GENERATED_DIRS,
+        )
+        if not refresh_context:
+            self.context_provider.check_interval = math.inf
+        self.store = TaskStore(task_db) if task_db else None
         self.tasks = self.load_tasks()
+        self.progress = ProgressJournal(progress_file) if progress_file else None
+        # Without resume the journal is only cleared once tasks are processed, so a dry run keeps it
+        self.resume = resume
+        if self.progress and resume:
+            self.restore_progress()
     
     def get_context(self):
-        """Reads the latest aggregated context from CONTEXT_FILE."""
+        """Returns the latest aggregated context from CONTEXT_FILE, re-reading it only when it changes."""
         try:
-            with open(CONTEXT_FILE, "r", encoding="utf-8") as f:
-                return f.read()
+            return self.context_provider.get()
         except Exception as e:
             self.logger.error(f"Failed to load context from {CONTEXT_FILE}: {e}")
             return ""
         
-    def prepare_prompt(self, task_prompt):
-        """Prepends the current context to the task prompt."""
-        context = self.get_context()
-        full_prompt = f"{context}\n\n{task_prompt}"
+    def prepare_prompt(self, task_prompt, file_name=None):
+        """
+        Prepends the current context to the task prompt. With a context budget, only the
+        files ranked most relevant to the task text and file name are included.
+        """
+        metrics = get_metrics()
+        with metrics.stage("context_load"):
+            context = self.get_context()
+        with metrics.stage("prompt_build"):
+            if self.context_budget and context:
+                query = f"{task_prompt} {file_name or ''}"
+                context = self.context_provider.selector().select(query, self.context_budget)
+            full_prompt = f"{context}\n\n{task_prompt}"
         return full_prompt
 
     def load_tasks(self):
-        """Load and parse the tasks.json file."""
+        """Load and parse the tasks.json file, or import it into the task store and load from there."""
+        if self.store:
+            # tasks.json is only imported when it changed since the last import
+            signature = self.file_signature()
+            if signature != self._imported_signature:
+                try:
+                    imported = self.store.import_json(TASK_FILE)
+                    self._imported_signature = signature
+                    if imported:
+                        self.logger.info(f"Imported {imported} new tasks from {TASK_FILE}.")
+                except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+                    self.logger.error(f"Error importing {TASK_FILE} - {e}")
+            return self.store.get_tasks()
         if not os.path.exists(TASK_FILE):
             self.logger.error("tasks.json not found.")
             return []
@@ -45,70 +158,237 @@ class TaskOrchestrator:
             self.logger.error("Error reading tasks.json.")
             return []
 
+    def restore_progress(self):
+        """
+        Applies the statuses of tasks that finished in an interrupted run but were never saved,
+        and logs the tasks that will resume mid-pipeline.
+        """
+        finished = resumed = 0
+        for task in self.tasks:
+            if task.get("status") != "pending":
+                continue
+            entry = self.progress.get(task)
+            if entry is None:
+                continue
+            if entry["stage"] == "finished":
+                task["status"] = entry["status"]
+                if self.store:
+                    self.store.update_status(task["id"], entry["status"])
+                finished += 1
+            else:
+                resumed += 1
+        if finished or resumed:
+            self.logger.info(f"Resuming an interrupted run: {finished} tasks already finished, "
+                             f"{resumed} continue after their last completed stage.")
+
     def save_tasks(self):
-        """Save the updated tasks.json file."""
+        """Save the updated tasks.json file. With a task store every change is already committed."""
+        if self.store:
+            return
         try:
-            with open(TASK_FILE, "w") as file:
-                json.dump({"tasks": self.tasks}, file, indent=4)
+            with tasks_lock:
+                self.merge_added_tasks()
+                with self._status_lock:
+                    snapshot = [dict(task) for task in self.tasks]
+                tmp_file = f"{TASK_FILE}.tmp"
+                with open(tmp_file, "w") as file:
+                    json.dump({"tasks": snapshot}, file, indent=4)
+                os.replace(tmp_file, TASK_FILE)
+                self._saved_signature = self.task_signature()
         except Exception as e:
             self.logger.error(f"Error saving tasks.json - {e}")
+            return
+        if self.progress:
+            # Saved statuses no longer need their journal entries
+            self.progress.discard(task["id"] for task in snapshot if task.get("status") != "pending")
+
+    def merge_added_tasks(self):
+        """Adopts tasks appended to tasks.json since it was loaded, so saving does not drop them."""
+        try:
+            with open(TASK_FILE, "r") as file:
+                on_disk = json.load(file).get("tasks", [])
+        except (OSError, json.JSONDecodeError):
+            return
+        with self._status_lock:
+            known = {task.get("id") for task in self.tasks}
+            added = [task for task in on_disk if task.get("id") is not None and task.get("id") not in known]
+            self.tasks.extend(added)
+        if added:
+            self.logger.info(f"Picked up {len(added)} tasks added to {TASK_FILE} during the run.")
+
+    def reload_tasks(self):
+        """Re-reads the tasks, e.g. after tasks.json was edited. Only call between batches."""
+        self.tasks = self.load_tasks()
+        if self.progress and self.resume:
+            self.restore_progress()
+
+    @staticmethod
+    def file_signature():
+        """(mtime, size) of tasks.json, or None if it does not exist."""
+        try:
+            stat = os.stat(TASK_FILE)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def task_signature(self):
+        """Cheap fingerprint of the task sources that changes when tasks are added or edited."""
+        signature = self.file_signature()
+        if self.store:
+            return signature, self.store.count("pending")
+        return signature
+
+    def set_status(self, task, status):
+        """Update a task's status; safe to call from worker threads."""
+        with self._status_lock:
+            task["status"] = status
+        if self.store:
+            self.store.update_status(task["id"], status)
+            if self.progress:
+                self.progress.discard([task["id"]])
+        elif self.progress and status != "blocked":
+            # Blocked is re-derived from the dependencies on every run, so it is not journaled
+            self.progress.record(task, "finished", status=status)
+
+    def record_progress(self, task, stage, script_file):
+        """Journals a completed stage and its script so a restarted run can continue from there."""
+        if self.progress:
+            self.progress.record(task, stage, script=script_file)
 
     def process_task(self, task):
-        """Process a single task."""
+        """
+        Generate, validate and audit the script for a single task.
+
+        Returns:
+            str: Path of the script when the task still has to be executed (see execute_task), else None.
+        """
         try:
             task_id = task.get("id")
             prompt = task.get("task")
             file_name = task.get("file_name")
             skip_auditor = task.get("skip_auditor", False)
             execute_flag = task.get("execute", False)
-            script_file = f"scripts/script_{task_id}.py"
+            script_file = f"script_{task_id}"
         except Exception as e:
             self.logger.error(f"Task {task_id}: Error parsing task - {e}")
             return
 
-        full_prompt = self.prepare_prompt(prompt)
-        self.logger.info(f"Processing Task {task_id}: {prompt}")
+        metrics = get_metrics()
+        progress = self.progress.get(task) if self.progress else None
+        completed = progress["stage"] if progress else None
+        if completed:
+            script_file = progress["script"]
+            self.logger.info(f"Processing Task {task_id}: resuming after stage '{completed}' with {script_file}")
+        else:
+            with metrics.task(task_id):
+                full_prompt = self.prepare_prompt(prompt, file_name)
+            self.logger.info(f"Processing Task {task_id}: {prompt}")
 
         try:
-            # Generate the script
-            if not generate_script(full_prompt, script_file, file_name=file_name):
-                self.logger.error(f"Task {task_id}: Script generation failed.")
-                task["status"] = "failed"
-                return
+            from agents.script_generator import generate_script
+            from agents.code_auditor import review_and_improve
+
+            if not completed:
+                # Generate the script
+                with metrics.stage("generation", task=task_id) as stage:
+                    script_file = generate_script(full_prompt, script_file, file_name=file_name, stream=self.stream)
+                    stage.ok = bool(script_file)
+                if not script_file:
+                    self.logger.error(f"Task {task_id}: Script generation failed.")
+                    self.set_status(task, "failed")
+                    return
+
+                self.logger.info(f"Task {task_id}: Script generated successfully.")
 
-            self.logger.info(f"Task {task_id}: Script generated successfully.")
+                # Validate before spending an audit call or an interpreter on it
+                script_file = self.validate_or_regenerate(task, full_prompt, script_file)
+                if not script_file:
+                    self.set_status(task, "invalid")
+                    return
+                self.record_progress(task, "generated", script_file)
 
             # Audit the script if required
-            if not skip_auditor:
-                script_file = review_and_improve(script_file)
+            if not skip_auditor and completed != "audited":
+                with metrics.stage("audit", task=task_id):
+                    script_file = review_and_improve(script_file, mode=self.review_mode, policy=self.audit_policy)
                 self.logger.info(f"Task {task_id}: Code reviewed and improved.")
+                self.record_progress(task, "audited", script_file)
 
-            # Execute the script if flagged
+            # Execution is handed to the execution stage
             if execute_flag:
-                if execute_script(script_file):
-                    self.logger.info(f"Task {task_id}: Execution successful.")
-                    task["status"] = "completed"
-                else:
-                    self.logger.error(f"Task {task_id}: Execution failed.")
-                    task["status"] = "execution_failed"
-            else:
-                self.logger.info(f"Task {task_id}: Execution skipped.")
-                task["status"] = "generated_only"
+                return script_file
+            self.logger.info(f"Task {task_id}: Execution skipped.")
+            self.set_status(task, "generated_only")
+
+        except Exception as e:
+            self.logger.error(f"Task {task_id}: An error occurred - {e}")
+            self.set_status(task, "error")
+        return None
 
-            # Mark task as done
-            mark_task_done(task_id)
+    def execute_task(self, task, script_file):
+        """Execute a task's generated script and record the outcome."""
+        from agents.executor import execute_script
 
+        task_id = task.get("id")
+        try:
+            with get_metrics().stage("execution", task=task_id) as stage:
+                stage.ok = execute_script(script_file, pool=self.pool, limits=self.limits)
+            if stage.ok:
+                self.logger.info(f"Task {task_id}: Execution successful.")
+                self.set_status(task, "completed")
+            else:
+                self.logger.error(f"Task {task_id}: Execution failed.")
+                self.set_status(task, "execution_failed")
         except Exception as e:
             self.logger.error(f"Task {task_id}: An error occurred - {e}")
-            task["status"] = "error"
+            self.set_status(task, "error")
+
+    def validate_or_regenerate(self, task, full_prompt, script_file):
+        """
+        Runs pre-flight validation on a generated script and regenerates it, with the errors
+        appended to the prompt, up to max_regenerations times.
+
+        Returns:
+            str: Path to a valid script, or None if no valid script was produced.
+        """
+        from agents.script_generator import generate_script
+        from agents.validator import validate_script
+
+        task_id = task.get("id")
+        metrics = get_metrics()
+        with metrics.stage("validation", task=task_id) as stage:
+            result = validate_script(script_file)
+            stage.ok = result.ok
+        attempt = 0
+        while not result.ok and attempt < self.max_regenerations:
+            attempt += 1
+            metrics.count("regenerations")
+            self.logger.warning(f"Task {task_id}: Script failed validation; regenerating ({attempt}/{self.max_regenerations}).")
+            os.remove(script_file)
+            errors = "\n".join(result.errors)
+            retry_prompt = (f"{full_prompt}\n\nA previous attempt failed these checks:\n{errors}\n"
+                            f"Return a corrected, complete script.")
+            with metrics.stage("generation", task=task_id) as stage:
+                script_file = generate_script(retry_prompt, f"script_{task_id}", file_name=task.get("file_name"),
+                                              stream=self.stream)
+                stage.ok = bool(script_file)
+            if not script_file:
+                return None
+            with metrics.stage("validation", task=task_id) as stage:
+                result = validate_script(script_file)
+                stage.ok = result.ok
+        if not result.ok:
+            self.logger.error(f"Task {task_id}: Script failed validation: {'; '.join(result.errors)}")
+            return None
+        return script_file
 
     def run(self):
-        """Run the task orchestration loop."""
+        """Run the task orchestration loop once over the pending tasks (see process_pending)."""
         self.logger.info("Starting task orchestration process...")
-        for task in self.tasks:
-            if task["status"] == "pending":
-                self.process_task(task)
-        self.save_tasks()
+        try:
+            self.process_pending()
+        finally:
+            self.close_pool()
         self.logger.info("Task processing complete.")
         # Final log line to confirm flush
         self.logger.info("Task processing complete, flushing logs now...")
@@ -116,6 +396,183 @@ class TaskOrchestrator:
         # Force a flush
         logging.shutdown()
 
+    def watch(self, interval=2.0):
+        """
+        Keeps the orchestrator running as a daemon. tasks.json (and the task store) is polled
+        every `interval` seconds, and new pending tasks are processed as soon as they appear,
+        reusing the API clients, loaded context and warm interpreters of earlier batches.
+        While idle, the context is regenerated incrementally when project sources change, so
+        the next task does not wait for it. Runs until interrupted or stop() is called.
+        """
+        self.logger.info(f"Watching {TASK_FILE} for new tasks every {interval:g}s (Ctrl+C to stop)...")
+        self._stop.clear()
+        seen = self.task_signature()
+        try:
+            while not self._stop.is_set():
+                signature = self.task_signature()
+                if signature != seen:
+                    seen = signature
+                    self.reload_tasks()
+                pending = [task for task in self.tasks if task.get("status") == "pending"]
+                if pending:
+                    self.process_pending()
+                    # Our own save of tasks.json needs no reload, but a later edit does. With a task
+                    # store, tasks may have been added during the batch, so always reload.
+                    seen = None if self.store else self._saved_signature
+                    if any(task.get("status") != "pending" for task in pending):
+                        continue
+                if self.context_provider.source_root:
+                    self.get_context()
+                self._wake.wait(interval)
+                self._wake.clear()
+        except KeyboardInterrupt:
+            self.logger.info("Watch mode interrupted.")
+        finally:
+            self.close_pool()
+        self.logger.info("Watch mode stopped.")
+        logging.shutdown()
+
+    def wake(self):
+        """Makes a watching orchestrator check for new tasks now instead of after its interval."""
+        self._wake.set()
+
+    def stop(self):
+        """Ends watch() after the current batch."""
+        self._stop.set()
+        self._wake.set()
+
+    def close_pool(self):
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+
+    def process_pending(self):
+        """
+        Processes the pending tasks once. They are handed to the workers in priority order,
+        and tasks with `depends_on` start once their dependencies have succeeded. Scripts to
+        execute go to a separate execution pool, so a worker starts on the next task while up
+        to `execution_workers` scripts run. The warm interpreter pool, if any, stays open.
+
+        Returns:
+            int: Number of tasks that were pending.
+        """
+        if self.progress and not self.resume:
+            self.progress.clear()
+            self.resume = True
+        metrics = MetricsRecorder(self.metrics_file)
+        previous_metrics = set_metrics(metrics)
+        scheduler = TaskScheduler(self.tasks, aging=self.aging)
+        pending = [task for task in self.tasks if task["status"] == "pending"]
+        for task in pending:
+            try:
+                self.block(scheduler.push(task))
+            except ValueError as e:
+                # A malformed task must not stop the others (or a daemon that retries it forever)
+                self.logger.error(f"Task {task.get('id')}: {e}; marked as error.")
+                self.set_status(task, "error")
+                self.block(scheduler.mark_done(task, "error"))
+        self.logger.info(f"Processing {len(pending)} tasks with {self.workers} workers "
+                         f"and {self.execution_workers} execution slots.")
+
+        if self.warm_pool and self.pool is None and any(task.get("execute") for task in pending):
+            from agents.warm_pool import WarmInterpreterPool
+
+            self.pool = WarmInterpreterPool(self.warm_pool, preload=self.preload, limits=self.limits)
+
+        done = 0
+        generating = {}
+        executing = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool, \
+                    ThreadPoolExecutor(max_workers=self.execution_workers) as execution_pool:
+                while True:
+                    while len(generating) < self.workers:
+                        task = scheduler.pop()
+                        if task is None:
+                            break
+                        generating[pool.submit(self.process_task, task)] = task
+                    if not generating and not executing:
+                        break
+                    finished, _ = wait(list(generating) + list(executing), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if future in generating:
+                            task = generating.pop(future)
+                            script_file = future.result()
+                            if script_file:
+                                # Dependents wait until the script has run
+                                executing[execution_pool.submit(self.execute_task, task, script_file)] = task
+                                continue
+                        else:
+                            task = executing.pop(future)
+                            future.result()
+                        self.block(scheduler.mark_done(task, task["status"]))
+                        done += 1
+                        self.checkpoint(done)
+        finally:
+            set_metrics(previous_metrics)
+            summary = metrics.write_summary()
+            metrics.close()
+        # Whatever is still waiting depends on something that can never finish, e.g. a cycle
+        self.block(scheduler.unresolved())
+        self.save_tasks()
+        self.logger.info(f"Run {metrics.run_id} stage timings:\n{format_summary(summary)}")
+        return len(pending)
+
+    def dry_run(self):
+        """
+        Logs the order in which pending tasks would run, assuming every task succeeds, without
+        calling the API or loading any pipeline stage.
+
+        Returns:
+            list: (task, planned status) pairs, where the status is "pending", "blocked", or
+                "error" for malformed tasks.
+        """
+        scheduler = TaskScheduler(self.tasks, aging=self.aging)
+        plan = []
+        for task in self.tasks:
+            if task.get("status") == "pending":
+                try:
+                    plan.extend((blocked, "blocked") for blocked in scheduler.push(task))
+                except ValueError as e:
+                    self.logger.error(f"Task {task.get('id')}: {e}.")
+                    plan.append((task, "error"))
+                    plan.extend((blocked, "blocked") for blocked in scheduler.mark_done(task, "error"))
+        while True:
+            task = scheduler.pop()
+            if task is None:
+                break
+            plan.append((task, "pending"))
+            scheduler.mark_done(task, "completed")
+        plan.extend((task, "blocked") for task in scheduler.unresolved())
+
+        for task, status in plan:
+            progress = self.progress.get(task) if self.progress and self.resume else None
+            completed = progress["stage"] if progress else None
+            steps = [] if completed else ["generate"]
+            if not task.get("skip_auditor", False) and completed != "audited":
+                steps.append("audit")
+            if task.get("execute", False):
+                steps.append("execute")
+            if completed:
+                steps.insert(0, f"(resumed after {completed})")
+            depends_on = task.get("depends_on")
+            self.logger.info(f"Task {task.get('id')} [{task.get('priority', 'medium')}] {status}: "
+                             f"{' -> '.join(steps)}{f', after {depends_on}' if depends_on else ''}")
+        self.logger.info(f"Dry run: {sum(status == 'pending' for _, status in plan)} tasks would run, "
+                         f"{sum(status == 'blocked' for _, status in plan)} are blocked.")
+        return plan
+
+    def block(self, tasks):
+        """Marks tasks whose dependencies failed or can never finish as blocked."""
+        for task in tasks:
+            self.logger.error(f"Task {task.get('id')}: Blocked by unmet dependencies {task.get('depends_on')}.")
+            self.set_status(task, "blocked")
+
+    def checkpoint(self, done):
+        """Save tasks.json every `checkpoint_every` finished tasks."""
+        if self.checkpoint_every and done % self.checkpoint_every == 0:
+            self.save_tasks()
+
 if __name__ == "__main__":
     orchestrator = TaskOrchestrator()
     orchestrator.run()
@@ -1,3 +1,4 @@
+import argparse
 import json
 import logging
 import os
@@ -51,7 +52,15 @@ def summarize_tasks(tasks):
 
 def main():
     """Main function to execute the task summary module."""
-    tasks = load_tasks(TASKS_FILE)
+    parser = argparse.ArgumentParser(description="Summarize task progress.")
+    parser.add_argument("--db", default=None, help="Read tasks from this SQLite task store instead of tasks.json")
+    args = parser.parse_args()
+
+    if args.db:
+        from agents.task_store import TaskStore
+        tasks = TaskStore(args.db).get_tasks()
+    else:
+        tasks = load_tasks(TASKS_FILE)
     if tasks:
         summarize_tasks(tasks)
     else: